@@ -1,3 +1,4 @@
+import re
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
@@ -29,9 +30,12 @@ from app.models.game_session import GameSession
 from app.models.answer import Answer
 from app.models.question import Question
 from app.models.question import Question
+from app.models.question_stat import QuestionStat
 from app.models.team import Team
 from app.models.team_member import TeamMember
 from app.models.user import User
+from app.models.user_game_summary import UserGameSummary
+from app.models.user_subject_stat import UserSubjectStat
 
 # add your model's MetaData object here
 # for 'autogenerate' support
@@ -44,6 +48,21 @@ target_metadata = [Base.metadata]# other values from the config, defined by the
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
+PARTITION_TABLE = re.compile(r"^(answers|game_sessions)_p\d{6}$")
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # monthly partitions are managed by app.commands.manage_partitions, not autogenerate
+    if type_ == "table" and reflected and compare_to is None and PARTITION_TABLE.match(name):
+        return False
+    # postgres clones a foreign key into a partitioned table once per referenced partition
+    if (
+        type_ == "foreign_key_constraint" and reflected and compare_to is None
+        and PARTITION_TABLE.match(object.referred_table.name)
+    ):
+        return False
+    return True
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -63,6 +82,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -84,7 +104,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,26 @@
+"""Add question difficulty lock
+
+Revision ID: 2c8f4b1d9e07
+Revises: 7b3f0d58e9a2
+Create Date: 2026-10-19 20:05:41.377012
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c8f4b1d9e07'
+down_revision: Union[str, None] = '7b3f0d58e9a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('questions', sa.Column('difficulty_locked', sa.Boolean(), server_default='false', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('questions', 'difficulty_locked')
@@ -0,0 +1,35 @@
+"""Add question stats
+
+Revision ID: 3861d46d8de4
+Revises: b9c7f748169f
+Create Date: 2026-10-19 12:20:51.377902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3861d46d8de4'
+down_revision: Union[str, None] = 'b9c7f748169f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('question_stats',
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('correct_count', sa.Integer(), nullable=False),
+    sa.Column('response_time_sum', sa.Float(), nullable=False),
+    sa.Column('response_time_sq_sum', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('question_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('question_stats')
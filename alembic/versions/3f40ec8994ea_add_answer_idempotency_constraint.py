@@ -0,0 +1,33 @@
+"""Add answer idempotency constraint
+
+Revision ID: 3f40ec8994ea
+Revises: 8ac987da8320
+Create Date: 2026-10-19 15:12:41.530918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f40ec8994ea'
+down_revision: Union[str, None] = '8ac987da8320'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DELETE FROM answers a
+        USING answers b
+        WHERE a.game_session_id = b.game_session_id
+          AND a.question_id = b.question_id
+          AND a.id > b.id
+    """)
+    op.create_unique_constraint('uq_answers_session_question', 'answers', ['game_session_id', 'question_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_answers_session_question', 'answers', type_='unique')
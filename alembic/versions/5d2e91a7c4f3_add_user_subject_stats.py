@@ -0,0 +1,38 @@
+"""Add user subject stats
+
+Revision ID: 5d2e91a7c4f3
+Revises: be83abb760e4
+Create Date: 2026-10-19 16:48:12.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e91a7c4f3'
+down_revision: Union[str, None] = 'be83abb760e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_subject_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('subject', sa.String(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('games_won', sa.Integer(), nullable=False),
+    sa.Column('total_score', sa.Float(), nullable=False),
+    sa.Column('correct_answers', sa.Integer(), nullable=False),
+    sa.Column('total_answers', sa.Integer(), nullable=False),
+    sa.Column('response_time_sum', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'subject')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_subject_stats')
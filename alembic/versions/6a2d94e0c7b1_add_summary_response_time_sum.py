@@ -0,0 +1,33 @@
+"""Add response time sum to user game summaries
+
+Revision ID: 6a2d94e0c7b1
+Revises: f3a8c61d0b95
+Create Date: 2026-10-20 09:12:36.540118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a2d94e0c7b1'
+down_revision: Union[str, None] = 'f3a8c61d0b95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user_game_summaries', sa.Column('response_time_sum', sa.Float(), server_default='0', nullable=False))
+    op.execute("""
+        UPDATE user_game_summaries s
+        SET response_time_sum = coalesce(gs.average_response_time, 0) * s.total_answers
+        FROM game_sessions gs
+        WHERE gs.game_id = s.game_id AND gs.user_id = s.user_id
+    """)
+    op.alter_column('user_game_summaries', 'response_time_sum', server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column('user_game_summaries', 'response_time_sum')
@@ -0,0 +1,26 @@
+"""Add finished games end time index
+
+Revision ID: 7b3f0d58e9a2
+Revises: e41c7a9d2b60
+Create Date: 2026-10-19 18:12:37.530114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3f0d58e9a2'
+down_revision: Union[str, None] = 'e41c7a9d2b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_games_finished_end_time', 'games', ['end_time', 'id'], unique=False, postgresql_where=sa.text("status = 'FINISHED'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_games_finished_end_time', table_name='games')
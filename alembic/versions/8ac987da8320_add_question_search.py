@@ -0,0 +1,32 @@
+"""Add question search
+
+Revision ID: 8ac987da8320
+Revises: 3861d46d8de4
+Create Date: 2026-10-19 13:41:09.226573
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8ac987da8320'
+down_revision: Union[str, None] = '3861d46d8de4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('questions', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("to_tsvector('english', question_text)", persisted=True), nullable=True))
+    op.create_index('ix_questions_search_vector', 'questions', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_questions_question_text_trgm', 'questions', ['question_text'], unique=False, postgresql_using='gin', postgresql_ops={'question_text': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_questions_question_text_trgm', table_name='questions', postgresql_using='gin', postgresql_ops={'question_text': 'gin_trgm_ops'})
+    op.drop_index('ix_questions_search_vector', table_name='questions', postgresql_using='gin')
+    op.drop_column('questions', 'search_vector')
@@ -0,0 +1,36 @@
+"""Add hot path indexes
+
+Revision ID: b9c7f748169f
+Revises: c17e2f055e4b
+Create Date: 2026-10-19 11:03:27.904116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9c7f748169f'
+down_revision: Union[str, None] = 'c17e2f055e4b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_unique_constraint('uq_game_sessions_game_user', 'game_sessions', ['game_id', 'user_id'])
+    op.create_index(op.f('ix_answers_game_session_id'), 'answers', ['game_session_id'], unique=False)
+    op.create_index(op.f('ix_teams_game_id'), 'teams', ['game_id'], unique=False)
+    op.create_index(op.f('ix_team_members_team_id'), 'team_members', ['team_id'], unique=False)
+    op.create_index(op.f('ix_team_members_user_id'), 'team_members', ['user_id'], unique=False)
+    op.create_index('ix_games_active', 'games', ['id'], unique=False, postgresql_where=sa.text("status IN ('WAITING', 'IN_PROGRESS')"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_games_active', table_name='games')
+    op.drop_index(op.f('ix_team_members_user_id'), table_name='team_members')
+    op.drop_index(op.f('ix_team_members_team_id'), table_name='team_members')
+    op.drop_index(op.f('ix_teams_game_id'), table_name='teams')
+    op.drop_index(op.f('ix_answers_game_session_id'), table_name='answers')
+    op.drop_constraint('uq_game_sessions_game_user', 'game_sessions', type_='unique')
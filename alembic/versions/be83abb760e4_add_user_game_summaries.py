@@ -0,0 +1,66 @@
+"""Add user game summaries
+
+Revision ID: be83abb760e4
+Revises: 3f40ec8994ea
+Create Date: 2026-10-19 16:04:40.740302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'be83abb760e4'
+down_revision: Union[str, None] = '3f40ec8994ea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_game_summaries',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('subject', sa.String(), nullable=False),
+    sa.Column('total_score', sa.Float(), nullable=False),
+    sa.Column('correct_answers', sa.Integer(), nullable=False),
+    sa.Column('total_answers', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=True),
+    sa.Column('team_score', sa.Float(), nullable=False),
+    sa.Column('opponent_score', sa.Float(), nullable=False),
+    sa.Column('is_winner', sa.Boolean(), nullable=False),
+    sa.Column('teammates', sa.JSON(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['games.id'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'game_id')
+    )
+    op.create_index('ix_user_game_summaries_user_finished', 'user_game_summaries', ['user_id', sa.text('finished_at DESC'), sa.text('game_id DESC')], unique=False)
+    op.execute("""
+        INSERT INTO user_game_summaries (user_id, game_id, subject, total_score, correct_answers,
+                                         total_answers, team_id, team_score, opponent_score,
+                                         is_winner, teammates, finished_at)
+        SELECT gs.user_id, g.id, g.subject, coalesce(gs.total_score, 0),
+               coalesce(gs.correct_answers, 0), coalesce(gs.total_answers, 0), t.id,
+               coalesce(t.total_score, 0),
+               coalesce((SELECT max(o.total_score) FROM teams o
+                         WHERE o.game_id = g.id AND o.id <> t.id), 0),
+               coalesce(t.is_winner, false),
+               coalesce((SELECT json_agg(json_build_object('user_id', u.id, 'username', u.username)
+                                         ORDER BY u.id)
+                         FROM team_members mate JOIN users u ON u.id = mate.user_id
+                         WHERE mate.team_id = t.id AND mate.user_id <> gs.user_id), '[]'),
+               coalesce(g.end_time, g.start_time, g.created_at)
+        FROM games g
+        JOIN game_sessions gs ON gs.game_id = g.id
+        LEFT JOIN (teams t JOIN team_members tm ON tm.team_id = t.id)
+               ON t.game_id = g.id AND tm.user_id = gs.user_id
+        WHERE g.status = 'FINISHED'
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_game_summaries_user_finished', table_name='user_game_summaries')
+    op.drop_table('user_game_summaries')
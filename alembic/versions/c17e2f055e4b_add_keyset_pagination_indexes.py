@@ -0,0 +1,34 @@
+"""Add keyset pagination indexes
+
+Revision ID: c17e2f055e4b
+Revises: a0edc4bb874c
+Create Date: 2026-10-19 10:12:40.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c17e2f055e4b'
+down_revision: Union[str, None] = 'a0edc4bb874c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_leaderboard', 'users', [sa.text('total_score DESC'), sa.text('id DESC')], unique=False, postgresql_where=sa.text('total_games > 0'))
+    op.create_index('ix_users_country_leaderboard', 'users', ['country', sa.text('total_score DESC'), sa.text('id DESC')], unique=False, postgresql_where=sa.text('total_games > 0'))
+    op.create_index('ix_questions_subject_id', 'questions', ['subject', 'id'], unique=False)
+    op.create_index('ix_questions_difficulty_id', 'questions', ['difficulty', 'id'], unique=False)
+    op.create_index('ix_questions_subject_difficulty_id', 'questions', ['subject', 'difficulty', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_questions_subject_difficulty_id', table_name='questions')
+    op.drop_index('ix_questions_difficulty_id', table_name='questions')
+    op.drop_index('ix_questions_subject_id', table_name='questions')
+    op.drop_index('ix_users_country_leaderboard', table_name='users')
+    op.drop_index('ix_users_leaderboard', table_name='users')
@@ -0,0 +1,166 @@
+"""Partition answers and game sessions by month of game creation
+
+Revision ID: e41c7a9d2b60
+Revises: 5d2e91a7c4f3
+Create Date: 2026-10-19 17:31:05.918244
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41c7a9d2b60'
+down_revision: Union[str, None] = '5d2e91a7c4f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def create_monthly_partitions(table: str, first_month_sql: str) -> None:
+    first = op.get_bind().execute(sa.text(
+        f"SELECT date_trunc('month', coalesce(({first_month_sql}), now()) AT TIME ZONE 'UTC')::date"
+    )).scalar()
+    today = date.today().replace(day=1)
+    month = min(first, today)
+    while month <= add_months(today, MONTHS_AHEAD):
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+            f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+        )
+        month = add_months(month, 1)
+
+
+def swap_in_partitioned_table(table: str, columns: str, constraints: str, indexes: Sequence[str], first_month_sql: str) -> None:
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_unpartitioned")
+    op.execute(f"ALTER TABLE {table}_unpartitioned DROP CONSTRAINT {table}_pkey")
+    for index in indexes:
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+    op.execute(f"""
+        CREATE TABLE {table} (
+            id integer NOT NULL DEFAULT nextval('{table}_id_seq'),
+            {columns},
+            game_created_at timestamp with time zone NOT NULL,
+            {constraints}
+        ) PARTITION BY RANGE (game_created_at)
+    """)
+    create_monthly_partitions(table, first_month_sql)
+    op.execute(f"CREATE INDEX ix_{table}_id ON {table} (id)")
+
+
+def upgrade() -> None:
+    # both tables are partitioned by the owning game's creation time, which never changes for a row,
+    # so a game's sessions and answers share a month and the unique keys stay as strict as before
+    op.execute("UPDATE games SET created_at = coalesce(start_time, now()) WHERE created_at IS NULL")
+    op.alter_column('games', 'created_at', nullable=False)
+
+    op.drop_constraint('answers_game_session_id_fkey', 'answers', type_='foreignkey')
+    op.drop_constraint('uq_answers_session_question', 'answers', type_='unique')
+    op.drop_constraint('uq_game_sessions_game_user', 'game_sessions', type_='unique')
+
+    swap_in_partitioned_table(
+        'game_sessions',
+        """
+            game_id integer NOT NULL REFERENCES games (id),
+            user_id integer NOT NULL REFERENCES users (id),
+            total_score double precision,
+            correct_answers integer,
+            total_answers integer,
+            average_response_time double precision,
+            created_at timestamp with time zone NOT NULL DEFAULT now()
+        """,
+        """
+            CONSTRAINT game_sessions_pkey PRIMARY KEY (id, game_created_at),
+            CONSTRAINT uq_game_sessions_game_user UNIQUE (game_id, user_id, game_created_at)
+        """,
+        ['ix_game_sessions_id'],
+        "SELECT min(g.created_at) FROM games g WHERE g.id IN (SELECT game_id FROM game_sessions_unpartitioned)"
+    )
+    op.execute("""
+        INSERT INTO game_sessions (id, game_id, user_id, total_score, correct_answers, total_answers,
+                                   average_response_time, created_at, game_created_at)
+        SELECT gs.id, gs.game_id, gs.user_id, gs.total_score, gs.correct_answers, gs.total_answers,
+               gs.average_response_time, coalesce(gs.created_at, now()), g.created_at
+        FROM game_sessions_unpartitioned gs
+        JOIN games g ON g.id = gs.game_id
+    """)
+
+    swap_in_partitioned_table(
+        'answers',
+        """
+            game_session_id integer NOT NULL,
+            question_id integer NOT NULL REFERENCES questions (id),
+            user_answer varchar NOT NULL,
+            is_correct boolean NOT NULL,
+            response_time double precision NOT NULL,
+            points_earned double precision,
+            answered_at timestamp with time zone NOT NULL DEFAULT now()
+        """,
+        """
+            CONSTRAINT answers_pkey PRIMARY KEY (id, game_created_at),
+            CONSTRAINT uq_answers_session_question UNIQUE (game_session_id, question_id, game_created_at),
+            CONSTRAINT answers_game_session_id_fkey FOREIGN KEY (game_session_id, game_created_at)
+                REFERENCES game_sessions (id, game_created_at)
+        """,
+        ['ix_answers_id', 'ix_answers_game_session_id'],
+        "SELECT min(game_created_at) FROM game_sessions"
+    )
+    op.execute("""
+        INSERT INTO answers (id, game_session_id, question_id, user_answer, is_correct,
+                             response_time, points_earned, answered_at, game_created_at)
+        SELECT a.id, a.game_session_id, a.question_id, a.user_answer, a.is_correct, a.response_time,
+               a.points_earned, coalesce(a.answered_at, now()), gs.game_created_at
+        FROM answers_unpartitioned a
+        JOIN game_sessions gs ON gs.id = a.game_session_id
+    """)
+    op.create_index(op.f('ix_answers_game_session_id'), 'answers', ['game_session_id'], unique=False)
+
+    for table in ('answers', 'game_sessions'):
+        op.execute(f"DROP TABLE {table}_unpartitioned")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+
+
+def downgrade() -> None:
+    op.drop_constraint('answers_game_session_id_fkey', 'answers', type_='foreignkey')
+    for table, column, columns in (
+        ('answers', 'answered_at', 'id, game_session_id, question_id, user_answer, is_correct, response_time, points_earned, answered_at'),
+        ('game_sessions', 'created_at', 'id, game_id, user_id, total_score, correct_answers, total_answers, average_response_time, created_at'),
+    ):
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+        op.execute(f"ALTER TABLE {table}_partitioned DROP CONSTRAINT {table}_pkey")
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_id")
+        op.execute(f"CREATE TABLE {table} (LIKE {table}_partitioned INCLUDING DEFAULTS)")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN game_created_at")
+        op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_partitioned")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP NOT NULL")
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)")
+        op.execute(f"CREATE INDEX ix_{table}_id ON {table} (id)")
+
+    op.execute("DROP INDEX IF EXISTS ix_answers_game_session_id")
+    op.execute("ALTER TABLE answers_partitioned DROP CONSTRAINT uq_answers_session_question")
+    op.execute("ALTER TABLE game_sessions_partitioned DROP CONSTRAINT uq_game_sessions_game_user")
+    for table in ('answers', 'game_sessions'):
+        op.execute(f"DROP TABLE {table}_partitioned")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+
+    op.create_index(op.f('ix_answers_game_session_id'), 'answers', ['game_session_id'], unique=False)
+    op.create_unique_constraint('uq_answers_session_question', 'answers', ['game_session_id', 'question_id'])
+    op.create_unique_constraint('uq_game_sessions_game_user', 'game_sessions', ['game_id', 'user_id'])
+    op.create_foreign_key('game_sessions_game_id_fkey', 'game_sessions', 'games', ['game_id'], ['id'])
+    op.create_foreign_key('game_sessions_user_id_fkey', 'game_sessions', 'users', ['user_id'], ['id'])
+    op.create_foreign_key('answers_question_id_fkey', 'answers', 'questions', ['question_id'], ['id'])
+    op.create_foreign_key('answers_game_session_id_fkey', 'answers', 'game_sessions', ['game_session_id'], ['id'])
+    op.alter_column('games', 'created_at', nullable=True)
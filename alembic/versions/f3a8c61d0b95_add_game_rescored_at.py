@@ -0,0 +1,28 @@
+"""Add game rescored_at
+
+Revision ID: f3a8c61d0b95
+Revises: 2c8f4b1d9e07
+Create Date: 2026-10-19 22:31:08.417265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c61d0b95'
+down_revision: Union[str, None] = '2c8f4b1d9e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('games', sa.Column('rescored_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_games_rescored_at', 'games', ['rescored_at'], unique=False, postgresql_where=sa.text('rescored_at IS NOT NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_games_rescored_at', table_name='games', postgresql_where=sa.text('rescored_at IS NOT NULL'))
+    op.drop_column('games', 'rescored_at')
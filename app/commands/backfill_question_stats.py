@@ -0,0 +1,20 @@
+import asyncio
+
+from app.database import SessionLocal, engine
+from app.models.game import Game
+from app.models.game_session import GameSession
+from app.models.answer import Answer
+from app.models.question import Question
+from app.models.team import Team
+from app.models.team_member import TeamMember
+from app.models.user import User
+from app.queries import questions as question_queries
+
+async def backfill_question_stats() -> None:
+    async with SessionLocal() as db:
+        rows = await question_queries.rebuild_question_stats(db)
+    await engine.dispose()
+    print(f"Rebuilt stats for {rows} questions")
+
+if __name__ == "__main__":
+    asyncio.run(backfill_question_stats())
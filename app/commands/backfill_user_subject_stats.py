@@ -0,0 +1,21 @@
+import asyncio
+
+from app.database import SessionLocal, engine
+from app.models.game import Game
+from app.models.game_session import GameSession
+from app.models.answer import Answer
+from app.models.question import Question
+from app.models.team import Team
+from app.models.team_member import TeamMember
+from app.models.user import User
+from app.models.user_subject_stat import UserSubjectStat
+from app.queries import users as user_queries
+
+async def backfill_user_subject_stats() -> None:
+    async with SessionLocal() as db:
+        rows = await user_queries.rebuild_user_subject_stats(db)
+    await engine.dispose()
+    print(f"Rebuilt subject stats for {rows} user/subject pairs")
+
+if __name__ == "__main__":
+    asyncio.run(backfill_user_subject_stats())
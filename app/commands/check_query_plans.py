@@ -0,0 +1,248 @@
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.database import engine
+from app.queries import game as game_queries
+from app.queries import leaderboard as leaderboard_queries
+from app.queries import matchmaking as matchmaking_queries
+from app.queries.partitions import PARTITIONED_TABLES
+from app.queries import questions as question_queries
+from app.queries import scoring as scoring_queries
+from app.queries import users as user_queries
+
+SEED_TABLES = [
+    "users", "questions", "games", "teams", "team_members", "game_sessions", "answers",
+    "user_game_summaries"
+]
+
+@dataclass
+class Sample:
+    game_id: int
+    user_id: int
+    country: str
+    subject: str
+    total_score: float
+
+HOT_QUERIES: List[Tuple[str, Callable[[AsyncSession, Sample], Awaitable[Any]]]] = [
+    ("get_game_session", lambda db, s: scoring_queries.get_game_session(db, s.game_id, s.user_id)),
+    ("get_user_game_stats_row", lambda db, s: scoring_queries.get_user_game_stats_row(db, s.user_id, s.game_id)),
+    ("get_game_with_teams_and_sessions", lambda db, s: game_queries.get_game_with_teams_and_sessions(db, s.game_id)),
+    ("get_user_active_game", lambda db, s: matchmaking_queries.get_user_active_game(db, s.user_id)),
+    ("get_global_leaderboard_entries", lambda db, s: leaderboard_queries.get_global_leaderboard_entries(db, 0, 50)),
+    ("get_global_leaderboard_entries (keyset)", lambda db, s: leaderboard_queries.get_global_leaderboard_entries(db, 0, 50, (s.total_score, s.user_id))),
+    ("get_location_leaderboard_entries", lambda db, s: leaderboard_queries.get_location_leaderboard_entries(db, s.country, 0, 50)),
+    ("get_location_leaderboard_entries (keyset)", lambda db, s: leaderboard_queries.get_location_leaderboard_entries(db, s.country, 0, 50, (s.total_score, s.user_id))),
+    ("get_user_game_summaries", lambda db, s: user_queries.get_user_game_summaries(db, s.user_id, 20)),
+    ("get_user_game_summaries (keyset)", lambda db, s: user_queries.get_user_game_summaries(db, s.user_id, 20, (datetime.now(timezone.utc), s.game_id))),
+    ("get_questions_with_filters", lambda db, s: question_queries.get_questions_with_filters(db, subject=s.subject, limit=50, after_id=0)),
+]
+
+async def seed(conn: AsyncConnection, scale: int) -> Sample:
+    params = {"users": 4000 * scale, "questions": 1000 * scale, "games": 1000 * scale}
+    base = {
+        table: (await conn.execute(text(f"SELECT coalesce(max(id), 0) FROM {table}"))).scalar()
+        for table in ["users", "questions", "games", "teams", "game_sessions"]
+    }
+    params.update({f"base_{table}": value for table, value in base.items()})
+
+    await conn.execute(text("""
+        INSERT INTO users (username, email, hashed_password, country, is_active, is_admin,
+                           total_games, total_wins, total_score)
+        SELECT 'plancheck_' || g, 'plancheck_' || g || '@example.com', 'x',
+               (ARRAY['IN', 'US', 'GB', 'DE'])[1 + g % 4], true, false,
+               g % 50, g % 20, (g * 7919 % 10000)::float
+        FROM generate_series(1, :users) g
+    """), params)
+    await conn.execute(text("""
+        INSERT INTO questions (subject, question_text, options, correct_answer, difficulty, points)
+        SELECT (ARRAY['Mathematics', 'Science', 'History', 'Geography'])[1 + g % 4],
+               'Plan check question ' || g, '["a", "b", "c", "d"]'::json, 'a',
+               (ARRAY['easy', 'medium', 'hard'])[1 + g % 3], 10
+        FROM generate_series(1, :questions) g
+    """), params)
+    await conn.execute(text("""
+        INSERT INTO games (subject, status, start_time)
+        SELECT 'Mathematics',
+               (CASE WHEN g % 100 = 0 THEN 'IN_PROGRESS' ELSE 'FINISHED' END)::gamestatus,
+               now()
+        FROM generate_series(1, :games) g
+    """), params)
+    for table in ["users", "questions"]:
+        params[f"first_{table}"] = (await conn.execute(
+            text(f"SELECT min(id) FROM {table} WHERE id > :base"),
+            {"base": params[f"base_{table}"]}
+        )).scalar()
+    await conn.execute(text("""
+        INSERT INTO teams (game_id, name, total_score, is_winner)
+        SELECT g.id, 'Team ' || t, 0, t = 1
+        FROM games g CROSS JOIN generate_series(1, 2) t
+        WHERE g.id > :base_games
+    """), params)
+    await conn.execute(text("""
+        INSERT INTO team_members (team_id, user_id)
+        SELECT t.id,
+               :first_users + ((t.game_id - :base_games) * 4
+                                  + (CASE t.name WHEN 'Team 1' THEN 0 ELSE 2 END) + m) % :users
+        FROM teams t CROSS JOIN generate_series(0, 1) m
+        WHERE t.id > :base_teams
+    """), params)
+    await conn.execute(text("""
+        INSERT INTO game_sessions (game_id, user_id, total_score, correct_answers,
+                                   total_answers, average_response_time, game_created_at)
+        SELECT t.game_id, tm.user_id, 25, 3, 5, 4.2, g.created_at
+        FROM team_members tm JOIN teams t ON t.id = tm.team_id JOIN games g ON g.id = t.game_id
+        WHERE t.id > :base_teams
+    """), params)
+    await conn.execute(text("""
+        INSERT INTO answers (game_session_id, question_id, user_answer, is_correct,
+                             response_time, points_earned, game_created_at)
+        SELECT gs.id, :first_questions + (gs.id * 5 + n) % :questions, 'a', n % 2 = 0, 4.2, 5,
+               gs.game_created_at
+        FROM game_sessions gs CROSS JOIN generate_series(0, 4) n
+        WHERE gs.id > :base_game_sessions
+    """), params)
+    await conn.execute(text("""
+        INSERT INTO user_game_summaries (user_id, game_id, subject, total_score, correct_answers,
+                                         total_answers, response_time_sum, team_id, team_score,
+                                         opponent_score, is_winner, teammates, finished_at)
+        SELECT gs.user_id, gs.game_id, 'Mathematics', gs.total_score, gs.correct_answers,
+               gs.total_answers, gs.average_response_time * gs.total_answers, t.id, 50, 40,
+               t.is_winner, '[]'::json,
+               now() - (gs.game_id - :base_games) * interval '1 minute'
+        FROM game_sessions gs
+        JOIN team_members tm ON tm.user_id = gs.user_id
+        JOIN teams t ON t.id = tm.team_id AND t.game_id = gs.game_id
+        WHERE gs.id > :base_game_sessions
+        ON CONFLICT DO NOTHING
+    """), params)
+
+    for table in SEED_TABLES:
+        await conn.execute(text(f"ANALYZE {table}"))
+
+    row = (await conn.execute(text("""
+        SELECT gs.game_id, gs.user_id, u.country, u.total_score
+        FROM game_sessions gs JOIN users u ON u.id = gs.user_id
+        WHERE gs.id > :base_game_sessions
+        ORDER BY gs.id
+        LIMIT 1
+    """), params)).one()
+
+    return Sample(
+        game_id=row.game_id,
+        user_id=row.user_id,
+        country=row.country,
+        subject="Mathematics",
+        total_score=row.total_score
+    )
+
+def find_seq_scans(plan: Dict[str, Any]) -> List[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+    return found
+
+def find_scanned_partitions(plan: Dict[str, Any]) -> Dict[str, set]:
+    # nodes pruned at run time are planned but never executed
+    found: Dict[str, set] = {}
+    relation = plan.get("Relation Name", "")
+    for table in PARTITIONED_TABLES:
+        if relation.startswith(f"{table}_p") and plan.get("Actual Loops", 0) > 0:
+            found.setdefault(table, set()).add(relation)
+    for child in plan.get("Plans", []):
+        for table, partitions in find_scanned_partitions(child).items():
+            found.setdefault(table, set()).update(partitions)
+    return found
+
+async def get_single_page_relations(conn: AsyncConnection, names: List[str]) -> List[str]:
+    if not names:
+        return []
+    result = await conn.execute(
+        text("SELECT relname FROM pg_class WHERE relname = ANY(:names) AND relpages <= 1"),
+        {"names": names}
+    )
+    return list(result.scalars().all())
+
+async def capture_statements(
+    db: AsyncSession,
+    query: Callable[[AsyncSession, Sample], Awaitable[Any]],
+    sample: Sample
+) -> List[Tuple[str, Any]]:
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        await query(db, sample)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    return statements
+
+async def check_query_plans(scale: int) -> int:
+    failures = 0
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            sample = await seed(conn, scale)
+            db = AsyncSession(bind=conn)
+
+            for name, query in HOT_QUERIES:
+                statements = await capture_statements(db, query, sample)
+                seq_scans = []
+                unpruned = set()
+                for statement, parameters in statements:
+                    result = await conn.exec_driver_sql(
+                        f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}", parameters
+                    )
+                    plan = result.scalar()
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    seq_scans.extend(find_seq_scans(plan[0]["Plan"]))
+                    for table, partitions in find_scanned_partitions(plan[0]["Plan"]).items():
+                        if len(partitions) > 1:
+                            unpruned.add(table)
+
+                # reading a partition that fits in one page is cheaper than any index
+                trivial = await get_single_page_relations(conn, sorted(set(seq_scans)))
+                seq_scans = [relation for relation in seq_scans if relation not in trivial]
+                if seq_scans:
+                    failures += 1
+                    print(f"FAIL {name}: sequential scan on {', '.join(sorted(set(seq_scans)))}")
+                elif unpruned:
+                    failures += 1
+                    print(f"FAIL {name}: reads more than one partition of {', '.join(sorted(unpruned))}")
+                else:
+                    print(f"ok   {name}")
+
+            db.expunge_all()
+        finally:
+            await trans.rollback()
+
+    await engine.dispose()
+    return failures
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Seed throwaway data and fail if hot queries plan a sequential scan or skip partition pruning."
+    )
+    parser.add_argument("--scale", type=int, default=1, help="Seed data multiplier")
+    args = parser.parse_args()
+
+    failures = asyncio.run(check_query_plans(args.scale))
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
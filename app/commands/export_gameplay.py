@@ -0,0 +1,42 @@
+import argparse
+import asyncio
+
+from app.database import engine, replica_engines
+from app.services.analytics_export import (
+    ANALYTICS_EXPORT_BATCH_ROWS,
+    ANALYTICS_EXPORT_DIR,
+    ANALYTICS_EXPORT_SETTLE_SECONDS,
+    EXPORT_FORMATS,
+    export_gameplay
+)
+
+async def run_export(export_dir: str, export_format: str, batch_rows: int, settle_seconds: int) -> dict:
+    try:
+        return await export_gameplay(export_dir, export_format, batch_rows, settle_seconds)
+    finally:
+        await engine.dispose()
+        for replica_engine in replica_engines:
+            await replica_engine.dispose()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Export answers and game sessions of finished games to date-partitioned Parquet or Arrow files."
+    )
+    parser.add_argument("--export-dir", default=ANALYTICS_EXPORT_DIR, help="Output directory, also holds the watermark")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="parquet", help="File format")
+    parser.add_argument("--batch-rows", type=int, default=ANALYTICS_EXPORT_BATCH_ROWS, help="Rows fetched and written per record batch")
+    parser.add_argument("--settle-seconds", type=int, default=ANALYTICS_EXPORT_SETTLE_SECONDS, help="Skip games finished more recently than this")
+    args = parser.parse_args()
+    
+    report = asyncio.run(run_export(args.export_dir, args.format, args.batch_rows, args.settle_seconds))
+    if not report["datasets"]:
+        print(f"Nothing new to export (watermark {report['after']})")
+        return
+    for dataset, result in report["datasets"].items():
+        print(f"{dataset}: {result['rows']} rows in {len(result['files'])} files")
+    print(f"Watermark advanced to finished_at={report['upto'][0].isoformat()} game_id={report['upto'][1]}")
+    if report["rescored_upto"] and report["rescored_upto"] != report["rescored_after"]:
+        print(f"Re-exported games rescored up to {report['rescored_upto'].isoformat()}")
+
+if __name__ == "__main__":
+    main()
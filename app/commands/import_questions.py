@@ -0,0 +1,37 @@
+import argparse
+import asyncio
+import json
+
+from app.database import SessionLocal, engine, redis_client
+from app.models.game import Game
+from app.models.game_session import GameSession
+from app.models.answer import Answer
+from app.models.question import Question
+from app.models.team import Team
+from app.models.team_member import TeamMember
+from app.models.user import User
+from app.services.question_import import IMPORT_FORMATS, detect_import_format, import_questions
+
+async def run_import(path: str, import_format: str, dry_run: bool, skip_duplicates: bool) -> dict:
+    with open(path, encoding="utf-8", newline="") as stream:
+        async with SessionLocal() as db:
+            report = await import_questions(
+                db, redis_client, stream, import_format, dry_run, skip_duplicates
+            )
+    await engine.dispose()
+    return report
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import questions from NDJSON or CSV.")
+    parser.add_argument("path", help="File to import")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Detected from the file name if omitted")
+    parser.add_argument("--dry-run", action="store_true", help="Validate and roll back without importing")
+    parser.add_argument("--skip-duplicates", action="store_true", help="Skip rows that closely match an existing question")
+    args = parser.parse_args()
+    
+    import_format = args.format or detect_import_format(args.path)
+    report = asyncio.run(run_import(args.path, import_format, args.dry_run, args.skip_duplicates))
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
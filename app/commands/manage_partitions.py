@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+
+from app.database import SessionLocal, engine
+from app.models.game import Game
+from app.models.game_session import GameSession
+from app.models.answer import Answer
+from app.models.question import Question
+from app.models.team import Team
+from app.models.team_member import TeamMember
+from app.models.user import User
+from app.queries import partitions as partition_queries
+from app.services.partitions import (
+    PARTITION_ARCHIVE_DIR,
+    PARTITION_MONTHS_AHEAD,
+    PARTITION_RETENTION_MONTHS,
+    archive_partitions,
+    ensure_partitions
+)
+
+async def list_partitions() -> None:
+    async with SessionLocal() as db:
+        for table in partition_queries.PARTITIONED_TABLES:
+            names = await partition_queries.get_partition_names(db, table)
+            print(f"{table}: {', '.join(names) or '-'}")
+    await engine.dispose()
+
+async def create_partitions(months_ahead: int) -> None:
+    async with SessionLocal() as db:
+        created = await ensure_partitions(db, months_ahead)
+    await engine.dispose()
+    print(f"Created {len(created)} partitions{': ' + ', '.join(created) if created else ''}")
+
+async def archive_cold_partitions(retention_months: int, archive_dir: str, drop: bool, dry_run: bool) -> None:
+    async with SessionLocal() as db:
+        archived = await archive_partitions(db, retention_months, archive_dir, drop, dry_run)
+    await engine.dispose()
+    
+    for partition in archived:
+        if dry_run:
+            print(f"would archive {partition['partition']}")
+        else:
+            print(f"archived {partition['partition']}: {partition['rows']} rows -> {partition['path']}")
+    action = "Would archive" if dry_run else ("Archived and dropped" if drop else "Archived and detached")
+    print(f"{action} {len(archived)} partitions")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Create upcoming monthly partitions and archive cold ones for answers and game_sessions."
+    )
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    
+    subparsers.add_parser("list", help="List attached partitions")
+    
+    create = subparsers.add_parser("create", help="Create partitions for this month and the months ahead")
+    create.add_argument("--months-ahead", type=int, default=PARTITION_MONTHS_AHEAD, help="Months to create past the current one")
+    
+    archive = subparsers.add_parser("archive", help="Export cold partitions to gzipped NDJSON, then detach them")
+    archive.add_argument("--retention-months", type=int, default=PARTITION_RETENTION_MONTHS, help="Months kept attached")
+    archive.add_argument("--archive-dir", default=PARTITION_ARCHIVE_DIR, help="Directory for archive files")
+    archive.add_argument("--drop", action="store_true", help="Drop partitions after detaching them")
+    archive.add_argument("--dry-run", action="store_true", help="Only list partitions that would be archived")
+    
+    args = parser.parse_args()
+    
+    if args.action == "list":
+        asyncio.run(list_partitions())
+    elif args.action == "create":
+        asyncio.run(create_partitions(args.months_ahead))
+    else:
+        asyncio.run(archive_cold_partitions(args.retention_months, args.archive_dir, args.drop, args.dry_run))
+
+if __name__ == "__main__":
+    main()
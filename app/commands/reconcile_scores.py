@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+import logging
+
+from app.database import SessionLocal, engine, redis_client
+from app.models.game import Game
+from app.models.game_session import GameSession
+from app.models.answer import Answer
+from app.models.question import Question
+from app.models.team import Team
+from app.models.team_member import TeamMember
+from app.models.user import User
+from app.services.score_reconciliation import SCORE_RECONCILE_TOLERANCE, reconcile_scores
+
+async def run_reconciliation(batch_size: int, repair: bool, tolerance: float, sample: int) -> int:
+    async with SessionLocal() as db:
+        result = await reconcile_scores(db, redis_client, batch_size, repair, tolerance)
+    await engine.dispose()
+    await redis_client.aclose()
+    
+    for drift in result["drift"][:sample]:
+        print(f"game {drift['game_id']} {drift['field']}: live {drift['live']:.2f}, durable {drift['durable']:.2f}")
+    action = "repaired" if repair else "found"
+    print(
+        f"Checked {result['games_checked']} games ({result['games_pending']} pending, "
+        f"{result['games_missing_live']} without live scores); {action} drift in "
+        f"{result['games_drifted']} games, {result['fields_drifted']} fields, max {result['max_drift']:.2f}"
+    )
+    return result["games_drifted"]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare live Redis scores with game_sessions and teams, optionally repairing Redis."
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="Games compared per round trip")
+    parser.add_argument("--repair", action="store_true", help="Overwrite drifted live scores with durable totals")
+    parser.add_argument("--tolerance", type=float, default=SCORE_RECONCILE_TOLERANCE, help="Allowed absolute drift")
+    parser.add_argument("--sample", type=int, default=20, help="Drifted fields to print")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_reconciliation(args.batch_size, args.repair, args.tolerance, args.sample))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import asyncio
+from typing import Any, Dict
+
+from app.database import SessionLocal, engine, redis_client
+from app.models.game import Game
+from app.models.game_session import GameSession
+from app.models.answer import Answer
+from app.models.question import Question
+from app.models.team import Team
+from app.models.team_member import TeamMember
+from app.models.user import User
+from app.queries import scoring as scoring_queries
+from app.queries import users as user_queries
+from app.services.rescoring import benchmark_scoring, rescore_rows
+from app.services.scoring import MAX_RESPONSE_TIME, invalidate_user_game_stats
+
+async def rescore_answers(max_time: float, chunk_size: int, dry_run: bool, sample: int) -> Dict[str, Any]:
+    summary = {"scanned": 0, "changed": 0, "points_delta": 0.0, "sessions_updated": 0}
+    after_id = 0
+    
+    async with SessionLocal() as db:
+        while True:
+            rows = await scoring_queries.get_finished_answers_chunk(db, after_id, chunk_size)
+            if not rows:
+                break
+            after_id = rows[-1].id
+            summary["scanned"] += len(rows)
+            
+            changes = rescore_rows(rows, max_time)
+            changed = len(changes["ids"])
+            if not changed:
+                continue
+            summary["changed"] += changed
+            summary["points_delta"] += float((changes["new_points"] - changes["old_points"]).sum())
+            
+            if dry_run:
+                remaining = max(sample - (summary["changed"] - changed), 0)
+                for answer_id, old, new in zip(
+                    changes["ids"][:remaining], changes["old_points"][:remaining], changes["new_points"][:remaining]
+                ):
+                    print(f"answer {answer_id}: {old:.2f} -> {new:.2f}")
+                continue
+            
+            await scoring_queries.update_answer_points(
+                db, changes["ids"].tolist(), changes["new_points"].tolist()
+            )
+            await user_queries.lock_user_subject_stats(db)
+            sessions = await scoring_queries.refresh_session_and_user_scores(
+                db, sorted(set(changes["session_ids"].tolist()))
+            )
+            await db.commit()
+            await invalidate_user_game_stats(redis_client, sessions)
+            summary["sessions_updated"] += len(sessions)
+    
+    await engine.dispose()
+    await redis_client.aclose()
+    return summary
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Recompute points for answers of finished games with the current scoring curve."
+    )
+    parser.add_argument("--max-time", type=float, default=MAX_RESPONSE_TIME, help="Response time at which points halve")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Answers fetched and updated per batch")
+    parser.add_argument("--dry-run", action="store_true", help="Report the diff without writing")
+    parser.add_argument("--sample", type=int, default=20, help="Changed answers to print in dry-run mode")
+    parser.add_argument("--benchmark", type=int, metavar="ROWS", help="Time scalar vs vectorized scoring on synthetic rows and exit")
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        result = benchmark_scoring(args.benchmark, args.max_time)
+        print(
+            f"{result['rows']} rows: scalar {result['scalar_seconds']:.4f}s, "
+            f"vectorized {result['vectorized_seconds']:.4f}s "
+            f"({result['speedup']:.1f}x), matches={result['matches']}"
+        )
+        return
+    
+    summary = asyncio.run(rescore_answers(args.max_time, args.chunk_size, args.dry_run, args.sample))
+    mode = "Would rescore" if args.dry_run else "Rescored"
+    print(
+        f"{mode} {summary['changed']} of {summary['scanned']} answers "
+        f"(points delta {summary['points_delta']:+.2f}, sessions updated {summary['sessions_updated']})"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,34 @@ class Config(object):
         self.DATABASE_PASSWORD = config.get("DATABASE_PASSWORD")
         self.DATABASE_HOST = config.get("DATABASE_HOST")
         self.DATABASE_NAME = config.get("DATABASE_NAME")
+        self.LEADERBOARD_SEASON_START = config.get("LEADERBOARD_SEASON_START")
+        self.LEADERBOARD_SEASON_DAYS = config.get("LEADERBOARD_SEASON_DAYS")
+        self.LEADERBOARD_BUCKET_RETENTION_DAYS = config.get("LEADERBOARD_BUCKET_RETENTION_DAYS")
+        self.SEEN_QUESTIONS_CAPACITY = config.get("SEEN_QUESTIONS_CAPACITY")
+        self.SEEN_QUESTIONS_ERROR_RATE = config.get("SEEN_QUESTIONS_ERROR_RATE")
+        self.SEEN_QUESTIONS_TTL_DAYS = config.get("SEEN_QUESTIONS_TTL_DAYS")
+        self.QUESTION_DIFFICULTY_MIX = config.get("QUESTION_DIFFICULTY_MIX")
+        self.PASSWORD_HASH_WORKERS = config.get("PASSWORD_HASH_WORKERS")
+        self.PASSWORD_HASH_MAX_PENDING = config.get("PASSWORD_HASH_MAX_PENDING")
+        self.DB_POOL_SIZE = config.get("DB_POOL_SIZE")
+        self.DB_MAX_OVERFLOW = config.get("DB_MAX_OVERFLOW")
+        self.DB_POOL_TIMEOUT = config.get("DB_POOL_TIMEOUT")
+        self.DB_POOL_RECYCLE = config.get("DB_POOL_RECYCLE")
+        self.DB_POOL_PRE_PING = config.get("DB_POOL_PRE_PING")
+        self.DB_STATEMENT_CACHE_SIZE = config.get("DB_STATEMENT_CACHE_SIZE")
+        self.DATABASE_REPLICA_URLS = config.get("DATABASE_REPLICA_URLS")
+        self.REPLICA_MAX_LAG_SECONDS = config.get("REPLICA_MAX_LAG_SECONDS")
+        self.READ_YOUR_WRITES_SECONDS = config.get("READ_YOUR_WRITES_SECONDS")
+        self.ANSWER_FLUSH_BATCH_SIZE = config.get("ANSWER_FLUSH_BATCH_SIZE")
+        self.ANSWER_FLUSH_INTERVAL_MS = config.get("ANSWER_FLUSH_INTERVAL_MS")
+        self.ANSWER_FLUSHER_TASKS = config.get("ANSWER_FLUSHER_TASKS")
+        self.SCORE_RECONCILE_TOLERANCE = config.get("SCORE_RECONCILE_TOLERANCE")
+        self.PARTITION_MONTHS_AHEAD = config.get("PARTITION_MONTHS_AHEAD")
+        self.PARTITION_RETENTION_MONTHS = config.get("PARTITION_RETENTION_MONTHS")
+        self.PARTITION_ARCHIVE_DIR = config.get("PARTITION_ARCHIVE_DIR")
+        self.ANALYTICS_EXPORT_DIR = config.get("ANALYTICS_EXPORT_DIR")
+        self.ANALYTICS_EXPORT_BATCH_ROWS = config.get("ANALYTICS_EXPORT_BATCH_ROWS")
+        self.ANALYTICS_EXPORT_SETTLE_SECONDS = config.get("ANALYTICS_EXPORT_SETTLE_SECONDS")
 
     def getConfig(self, env: str):
         config_parser = ConfigParser()
@@ -1,25 +1,192 @@
-from sqlalchemy import create_engine
+import asyncio
+import random
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from fastapi import HTTPException
+from starlette.requests import HTTPConnection
+from sqlalchemy import create_engine, event, exc, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import redis.asyncio as redis
 from app.config.config import Config
+from app.utils.auth import decode_access_token, get_token_user_id
 config = Config()
 
-engine = create_async_engine(config.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"))
+REPLICA_MAX_LAG_SECONDS = float(config.REPLICA_MAX_LAG_SECONDS)
+REPLICA_LAG_CHECK_SECONDS = 5
+READ_YOUR_WRITES_SECONDS = int(config.READ_YOUR_WRITES_SECONDS)
+# a standby whose WAL receiver is not streaming has replayed everything it received and
+# still looks current, so it counts as infinitely behind; the status column needs
+# pg_read_all_stats and is only trusted when visible
+REPLICA_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver
+            WHERE pid IS NOT NULL AND coalesce(status, 'streaming') = 'streaming'
+        ) THEN 'Infinity'::float8
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())::float8
+    END
+"""
+
+pool_metrics: Dict[str, float] = {
+    "checkouts": 0,
+    "timeouts": 0,
+    "checkout_wait_seconds_total": 0.0,
+    "checkout_wait_seconds_max": 0.0,
+    "peak_checked_out": 0,
+    "peak_overflow": 0
+}
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics["timeouts"] += 1
+            raise
+        
+        wait = time.perf_counter() - started_at
+        pool_metrics["checkouts"] += 1
+        pool_metrics["checkout_wait_seconds_total"] += wait
+        pool_metrics["checkout_wait_seconds_max"] = max(pool_metrics["checkout_wait_seconds_max"], wait)
+        pool_metrics["peak_checked_out"] = max(pool_metrics["peak_checked_out"], self.checkedout())
+        pool_metrics["peak_overflow"] = max(pool_metrics["peak_overflow"], self.overflow())
+        return connection
+
+def build_engine(url: str, **kwargs: Any):
+    return create_async_engine(
+        url.replace("postgresql://", "postgresql+asyncpg://"),
+        pool_size=int(config.DB_POOL_SIZE),
+        max_overflow=int(config.DB_MAX_OVERFLOW),
+        pool_timeout=float(config.DB_POOL_TIMEOUT),
+        pool_recycle=int(config.DB_POOL_RECYCLE),
+        pool_pre_ping=config.DB_POOL_PRE_PING.lower() in ("1", "true", "yes"),
+        connect_args={"statement_cache_size": int(config.DB_STATEMENT_CACHE_SIZE)},
+        **kwargs
+    )
+
+engine = build_engine(config.DATABASE_URL, poolclass=InstrumentedQueuePool)
 SessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+replica_engines = [
+    build_engine(url.strip())
+    for url in (config.DATABASE_REPLICA_URLS or "").split(",") if url.strip()
+]
+ReplicaSessionLocals = [
+    sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    for replica_engine in replica_engines
+]
+_replica_lag: Dict[int, Tuple[float, float]] = {}
+_background_tasks: Set[asyncio.Task] = set()
+
 Base = declarative_base()
 
 # Redis setup
 redis_client = redis.from_url( config.REDIS_URL, decode_responses=True)
 
-async def get_db():
+def get_pool_metrics() -> Dict[str, Any]:
+    pool = engine.pool
+    checkouts = pool_metrics["checkouts"]
+    return {
+        **pool_metrics,
+        "checkout_wait_seconds_avg": pool_metrics["checkout_wait_seconds_total"] / checkouts if checkouts else 0,
+        "pool_size": pool.size(),
+        "max_overflow": int(config.DB_MAX_OVERFLOW),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "replicas": get_replica_status()
+    }
+
+async def get_db(connection: HTTPConnection):
     async with SessionLocal() as session:
+        session.sync_session.info["user_id"] = get_connection_user_id(connection)
         try:
             yield session
         finally:
             await session.close()
 
 async def get_redis():
-    return redis_client 
\ No newline at end of file
+    return redis_client
+
+def get_recent_write_key(user_id: int) -> str:
+    return f"db:recent_write:{user_id}"
+
+def get_connection_user_id(connection: HTTPConnection) -> Optional[int]:
+    scheme, _, token = connection.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer":
+        token = connection.query_params.get("token")
+    if not token:
+        return None
+    
+    try:
+        return get_token_user_id(decode_access_token(token))
+    except HTTPException:
+        return None
+
+@event.listens_for(Session, "after_commit")
+def mark_recent_write(session: Session) -> None:
+    user_id = session.info.get("user_id")
+    if user_id is None or not replica_engines:
+        return
+    
+    task = asyncio.get_running_loop().create_task(
+        redis_client.set(get_recent_write_key(user_id), 1, ex=READ_YOUR_WRITES_SECONDS)
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+async def get_replica_lag(index: int) -> float:
+    checked_at, lag = _replica_lag.get(index, (0.0, 0.0))
+    if time.monotonic() - checked_at < REPLICA_LAG_CHECK_SECONDS:
+        return lag
+    
+    try:
+        async with replica_engines[index].connect() as conn:
+            lag = float((await conn.execute(text(REPLICA_LAG_QUERY))).scalar() or 0)
+    except Exception:
+        lag = float("inf")
+    
+    _replica_lag[index] = (time.monotonic(), lag)
+    return lag
+
+async def get_read_sessionmaker(user_id: Optional[int]) -> sessionmaker:
+    if not ReplicaSessionLocals:
+        return SessionLocal
+    
+    if user_id is not None and await redis_client.exists(get_recent_write_key(user_id)):
+        return SessionLocal
+    
+    candidates = [
+        index for index in range(len(ReplicaSessionLocals))
+        if await get_replica_lag(index) <= REPLICA_MAX_LAG_SECONDS
+    ]
+    if not candidates:
+        return SessionLocal
+    
+    return ReplicaSessionLocals[random.choice(candidates)]
+
+async def get_read_db(connection: HTTPConnection):
+    session_factory = await get_read_sessionmaker(get_connection_user_id(connection))
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+def get_replica_status() -> List[Dict[str, Any]]:
+    status = []
+    for index in range(len(replica_engines)):
+        lag = _replica_lag[index][1] if index in _replica_lag else None
+        status.append({
+            "replica": index,
+            "lag_seconds": lag if lag != float("inf") else None,
+            "unreachable": lag == float("inf"),
+            "in_rotation": lag is None or lag <= REPLICA_MAX_LAG_SECONDS
+        })
+    return status
\ No newline at end of file
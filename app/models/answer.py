@@ -1,19 +1,29 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, ForeignKeyConstraint, Text, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
 class Answer(Base):
     __tablename__ = "answers"
+    __table_args__ = (
+        UniqueConstraint("game_session_id", "question_id", "game_created_at", name="uq_answers_session_question"),
+        ForeignKeyConstraint(
+            ["game_session_id", "game_created_at"],
+            ["game_sessions.id", "game_sessions.game_created_at"],
+            name="answers_game_session_id_fkey"
+        ),
+        {"postgresql_partition_by": "RANGE (game_created_at)"},
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    game_session_id = Column(Integer, ForeignKey("game_sessions.id"), nullable=False)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    game_session_id = Column(Integer, nullable=False, index=True)
     question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
     user_answer = Column(String, nullable=False)
     is_correct = Column(Boolean, nullable=False)
     response_time = Column(Float, nullable=False)  # in seconds
     points_earned = Column(Float, default=0.0)
-    answered_at = Column(DateTime(timezone=True), server_default=func.now())
+    answered_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    game_created_at = Column(DateTime(timezone=True), primary_key=True)
         
     game_session = relationship("GameSession", back_populates="answers")
     question = relationship("Question", back_populates="answers") 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -18,8 +18,27 @@ class Game(Base):
     status = Column(Enum(GameStatus), default=GameStatus.WAITING)
     start_time = Column(DateTime(timezone=True))
     end_time = Column(DateTime(timezone=True))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    rescored_at = Column(DateTime(timezone=True))
     
     
     teams = relationship("Team", back_populates="game")
-    game_sessions = relationship("GameSession", back_populates="game")
\ No newline at end of file
+    game_sessions = relationship("GameSession", back_populates="game")
+
+
+Index(
+    "ix_games_active",
+    Game.id,
+    postgresql_where=Game.status.in_([GameStatus.WAITING, GameStatus.IN_PROGRESS])
+)
+Index(
+    "ix_games_finished_end_time",
+    Game.end_time,
+    Game.id,
+    postgresql_where=Game.status == GameStatus.FINISHED
+)
+Index(
+    "ix_games_rescored_at",
+    Game.rescored_at,
+    postgresql_where=Game.rescored_at.isnot(None)
+)
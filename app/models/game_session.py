@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Text, Enum, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -7,15 +7,20 @@ import enum
 
 class GameSession(Base):
     __tablename__ = "game_sessions"
+    __table_args__ = (
+        UniqueConstraint("game_id", "user_id", "game_created_at", name="uq_game_sessions_game_user"),
+        {"postgresql_partition_by": "RANGE (game_created_at)"},
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     game_id = Column(Integer, ForeignKey("games.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     total_score = Column(Float, default=0.0)
     correct_answers = Column(Integer, default=0)
     total_answers = Column(Integer, default=0)
     average_response_time = Column(Float, default=0.0)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    game_created_at = Column(DateTime(timezone=True), primary_key=True)
     
     
     game = relationship("Game", back_populates="game_sessions")
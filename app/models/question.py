@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Text, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Text, JSON, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -12,7 +13,21 @@ class Question(Base):
     options = Column(JSON, nullable=False)  # List of options
     correct_answer = Column(String, nullable=False)
     difficulty = Column(String, default="medium")  # easy, medium, hard
+    difficulty_locked = Column(Boolean, nullable=False, default=False, server_default="false")
     points = Column(Integer, default=10)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    search_vector = deferred(Column(TSVECTOR, Computed("to_tsvector('english', question_text)", persisted=True)))
     
-    answers = relationship("Answer", back_populates="question")
\ No newline at end of file
+    answers = relationship("Answer", back_populates="question")
+
+
+Index("ix_questions_subject_id", Question.subject, Question.id)
+Index("ix_questions_difficulty_id", Question.difficulty, Question.id)
+Index("ix_questions_subject_difficulty_id", Question.subject, Question.difficulty, Question.id)
+Index("ix_questions_search_vector", Question.search_vector, postgresql_using="gin")
+Index(
+    "ix_questions_question_text_trgm",
+    Question.question_text,
+    postgresql_using="gin",
+    postgresql_ops={"question_text": "gin_trgm_ops"}
+)
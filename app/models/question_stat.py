@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, DateTime, Float, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+class QuestionStat(Base):
+    __tablename__ = "question_stats"
+    
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    correct_count = Column(Integer, nullable=False, default=0)
+    response_time_sum = Column(Float, nullable=False, default=0.0)
+    response_time_sq_sum = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
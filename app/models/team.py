@@ -7,7 +7,7 @@ class Team(Base):
     __tablename__ = "teams"
     
     id = Column(Integer, primary_key=True, index=True)
-    game_id = Column(Integer, ForeignKey("games.id"), nullable=False)
+    game_id = Column(Integer, ForeignKey("games.id"), nullable=False, index=True)
     name = Column(String, nullable=False)
     total_score = Column(Float, default=0.0)
     is_winner = Column(Boolean, default=False)
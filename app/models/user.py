@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -22,4 +22,19 @@ class User(Base):
     
     
     game_sessions = relationship("GameSession", back_populates="user")
-    team_memberships = relationship("TeamMember", back_populates="user") 
\ No newline at end of file
+    team_memberships = relationship("TeamMember", back_populates="user")
+
+
+Index(
+    "ix_users_leaderboard",
+    User.total_score.desc(),
+    User.id.desc(),
+    postgresql_where=User.total_games > 0
+)
+Index(
+    "ix_users_country_leaderboard",
+    User.country,
+    User.total_score.desc(),
+    User.id.desc(),
+    postgresql_where=User.total_games > 0
+)
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, JSON, Index
+from app.database import Base
+
+class UserGameSummary(Base):
+    __tablename__ = "user_game_summaries"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    game_id = Column(Integer, ForeignKey("games.id"), primary_key=True)
+    subject = Column(String, nullable=False)
+    total_score = Column(Float, nullable=False, default=0.0)
+    correct_answers = Column(Integer, nullable=False, default=0)
+    total_answers = Column(Integer, nullable=False, default=0)
+    response_time_sum = Column(Float, nullable=False, default=0.0)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
+    team_score = Column(Float, nullable=False, default=0.0)
+    opponent_score = Column(Float, nullable=False, default=0.0)
+    is_winner = Column(Boolean, nullable=False, default=False)
+    teammates = Column(JSON, nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=False)
+
+
+Index(
+    "ix_user_game_summaries_user_finished",
+    UserGameSummary.user_id,
+    UserGameSummary.finished_at.desc(),
+    UserGameSummary.game_id.desc()
+)
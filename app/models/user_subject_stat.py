@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+class UserSubjectStat(Base):
+    __tablename__ = "user_subject_stats"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    subject = Column(String, primary_key=True)
+    games_played = Column(Integer, nullable=False, default=0)
+    games_won = Column(Integer, nullable=False, default=0)
+    total_score = Column(Float, nullable=False, default=0.0)
+    correct_answers = Column(Integer, nullable=False, default=0)
+    total_answers = Column(Integer, nullable=False, default=0)
+    response_time_sum = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+
+FINISHED_GAMES_WINDOW = """
+    SELECT id, subject, created_at, end_time, rescored_at
+    FROM games
+    WHERE status = 'FINISHED'
+      AND (end_time, id) <= (:upto_time, :upto_id)
+      AND (
+          CAST(:after_time AS timestamptz) IS NULL
+          OR (end_time, id) > (:after_time, :after_id)
+          OR (rescored_at > coalesce(CAST(:rescored_after AS timestamptz), '-infinity')
+              AND rescored_at <= :rescored_upto)
+      )
+"""
+
+EXPORT_QUERIES = {
+    "answers": f"""
+        WITH finished AS ({FINISHED_GAMES_WINDOW})
+        SELECT a.id AS answer_id, g.id AS game_id, gs.user_id, a.question_id,
+               q.subject, q.difficulty, a.user_answer, a.is_correct, a.response_time,
+               a.points_earned, a.answered_at, g.end_time AS finished_at, g.rescored_at
+        FROM finished g
+        JOIN game_sessions gs ON gs.game_id = g.id AND gs.game_created_at = g.created_at
+        JOIN answers a ON a.game_session_id = gs.id AND a.game_created_at = g.created_at
+        JOIN questions q ON q.id = a.question_id
+        ORDER BY g.end_time, g.id, a.id
+    """,
+    "game_sessions": f"""
+        WITH finished AS ({FINISHED_GAMES_WINDOW})
+        SELECT gs.id AS game_session_id, g.id AS game_id, gs.user_id, g.subject,
+               t.id AS team_id, coalesce(t.is_winner, false) AS is_winner, gs.total_score,
+               gs.correct_answers, gs.total_answers, gs.average_response_time,
+               gs.created_at, g.end_time AS finished_at, g.rescored_at
+        FROM finished g
+        JOIN game_sessions gs ON gs.game_id = g.id AND gs.game_created_at = g.created_at
+        LEFT JOIN (teams t JOIN team_members tm ON tm.team_id = t.id)
+               ON t.game_id = g.id AND tm.user_id = gs.user_id
+        ORDER BY g.end_time, g.id, gs.id
+    """,
+}
+
+async def get_finished_games_high_watermark(db: AsyncSession, until: datetime) -> Optional[Tuple[datetime, int]]:
+    result = await db.execute(
+        text("""
+            SELECT end_time, id FROM games
+            WHERE status = 'FINISHED' AND end_time < :until
+            ORDER BY end_time DESC, id DESC
+            LIMIT 1
+        """),
+        {"until": until}
+    )
+    row = result.first()
+    return (row.end_time, row.id) if row else None
+
+async def get_rescored_games_high_watermark(db: AsyncSession, until: datetime) -> Optional[datetime]:
+    result = await db.execute(
+        text("SELECT max(rescored_at) FROM games WHERE rescored_at < :until"),
+        {"until": until}
+    )
+    return result.scalar()
+
+async def stream_export_rows(
+    db: AsyncSession,
+    dataset: str,
+    after: Optional[Tuple[datetime, int]],
+    upto: Tuple[datetime, int],
+    rescored_after: Optional[datetime],
+    rescored_upto: Optional[datetime],
+    batch_size: int
+) -> AsyncIterator[List[Any]]:
+    after_time, after_id = after or (None, 0)
+    result = await db.stream(
+        text(EXPORT_QUERIES[dataset]),
+        {
+            "after_time": after_time,
+            "after_id": after_id,
+            "upto_time": upto[0],
+            "upto_id": upto[1],
+            "rescored_after": rescored_after,
+            "rescored_upto": rescored_upto
+        },
+        execution_options={"yield_per": batch_size}
+    )
+    async for partition in result.partitions():
+        yield partition
@@ -7,6 +7,10 @@ async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User
     result = await db.execute(select(User).where(User.username == username))
     return result.scalar_one_or_none()
 
+async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+    result = await db.execute(select(User).where(User.id == user_id))
+    return result.scalar_one_or_none()
+
 async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     result = await db.execute(select(User).where(User.email == email))
     return result.scalar_one_or_none()
@@ -29,4 +33,18 @@ async def create_user(
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    return user
+
+async def update_user_flags(
+    db: AsyncSession,
+    user: User,
+    is_active: Optional[bool] = None,
+    is_admin: Optional[bool] = None
+) -> User:
+    if is_active is not None:
+        user.is_active = is_active
+    if is_admin is not None:
+        user.is_admin = is_admin
+    await db.commit()
+    await db.refresh(user)
     return user
\ No newline at end of file
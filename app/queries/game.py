@@ -1,24 +1,33 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from datetime import datetime
 from app.models.game import Game, GameStatus
 from app.models.game_session import GameSession
 from app.models.team import Team
 from app.models.question import Question
+from app.models.user_game_summary import UserGameSummary
 
 async def get_game_with_teams_and_sessions(
     db: AsyncSession,
     game_id: int
 ) -> Optional[Game]:
+    game = await get_game_with_teams(db, game_id)
+    if not game:
+        return None
+    
+    # filtering on the partition key lets postgres read only the game's month
     result = await db.execute(
-        select(Game).options(
-            selectinload(Game.teams).selectinload(Team.members),
-            selectinload(Game.game_sessions)
-        ).where(Game.id == game_id)
+        select(GameSession).where(
+            GameSession.game_id == game.id,
+            GameSession.game_created_at == game.created_at
+        )
     )
-    return result.scalar_one_or_none()
+    set_committed_value(game, "game_sessions", list(result.scalars().all()))
+    return game
 
 async def get_game_with_teams(
     db: AsyncSession,
@@ -48,27 +57,33 @@ async def update_game_status(
 async def create_game_session(
     db: AsyncSession,
     game_id: int,
-    user_id: int
+    user_id: int,
+    game_created_at: datetime
 ) -> GameSession:
     game_session = GameSession(
         game_id=game_id,
-        user_id=user_id
+        user_id=user_id,
+        game_created_at=game_created_at
     )
     db.add(game_session)
     return game_session
 
-async def get_random_unused_questions_by_subject(
+async def get_questions_by_ids(
     db: AsyncSession,
-    subject: str,
-    count: int,
-    exclude_ids: List[int] = None
+    question_ids: List[int]
 ) -> List[Question]:
-    query = select(Question).where(Question.subject == subject)
-    
-    if exclude_ids:
-        query = query.where(~Question.id.in_(exclude_ids))
-    
-    query = query.order_by(func.random()).limit(count)
-    
-    result = await db.execute(query)
-    return result.scalars().all()
\ No newline at end of file
+    result = await db.execute(
+        select(Question).where(Question.id.in_(question_ids))
+    )
+    questions = {question.id: question for question in result.scalars().all()}
+    return [questions[question_id] for question_id in question_ids if question_id in questions]
+
+async def insert_user_game_summaries(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[int]:
+    if not rows:
+        return []
+    result = await db.execute(
+        insert(UserGameSummary).values(rows).on_conflict_do_nothing(
+            index_elements=[UserGameSummary.user_id, UserGameSummary.game_id]
+        ).returning(UserGameSummary.user_id)
+    )
+    return list(result.scalars().all())
\ No newline at end of file
@@ -1,50 +1,72 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func, desc
+from sqlalchemy import select, and_, func, desc, tuple_
 
 from app.models.user import User
 
 async def get_global_leaderboard_entries(
     db: AsyncSession,
     offset: int,
-    limit: int
-) -> Tuple[List[User], int]:
+    limit: int,
+    after: Optional[Tuple[float, int]] = None
+) -> List[User]:
+    query = select(User).where(User.total_games > 0)
+    
+    if after:
+        query = query.where(tuple_(User.total_score, User.id) < tuple_(*after))
+    else:
+        query = query.offset(offset)
+    
     result = await db.execute(
-        select(User)
-        .where(User.total_games > 0)
-        .order_by(desc(User.total_score))
-        .offset(offset)
+        query
+        .order_by(desc(User.total_score), desc(User.id))
         .limit(limit)
     )
-    users = result.scalars().all()
-    
-    count_result = await db.execute(
+    return result.scalars().all()
+
+async def count_global_leaderboard_entries(db: AsyncSession) -> int:
+    result = await db.execute(
         select(func.count(User.id))
         .where(User.total_games > 0)
     )
-    total_entries = count_result.scalar()
-    
-    return users, total_entries
+    return result.scalar()
 
 async def get_location_leaderboard_entries(
     db: AsyncSession,
     country: str,
     offset: int,
-    limit: int
-) -> Tuple[List[User], int]:
+    limit: int,
+    after: Optional[Tuple[float, int]] = None
+) -> List[User]:
+    query = select(User).where(and_(User.country == country, User.total_games > 0))
+    
+    if after:
+        query = query.where(tuple_(User.total_score, User.id) < tuple_(*after))
+    else:
+        query = query.offset(offset)
+    
     result = await db.execute(
-        select(User)
-        .where(and_(User.country == country, User.total_games > 0))
-        .order_by(desc(User.total_score))
-        .offset(offset)
+        query
+        .order_by(desc(User.total_score), desc(User.id))
         .limit(limit)
     )
-    users = result.scalars().all()
-    
-    count_result = await db.execute(
+    return result.scalars().all()
+
+async def count_location_leaderboard_entries(db: AsyncSession, country: str) -> int:
+    result = await db.execute(
         select(func.count(User.id))
         .where(and_(User.country == country, User.total_games > 0))
     )
-    total_entries = count_result.scalar()
+    return result.scalar()
+
+async def get_users_by_ids(
+    db: AsyncSession,
+    user_ids: List[int]
+) -> List[User]:
+    if not user_ids:
+        return []
     
-    return users, total_entries
\ No newline at end of file
+    result = await db.execute(
+        select(User).where(User.id.in_(user_ids))
+    )
+    return result.scalars().all()
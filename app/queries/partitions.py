@@ -0,0 +1,62 @@
+from datetime import date
+from typing import Any, AsyncIterator, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+
+PARTITIONED_TABLES = ("answers", "game_sessions")
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def get_partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+def get_partition_month(table: str, name: str) -> date:
+    suffix = name[len(table) + 2:]
+    return date(int(suffix[:4]), int(suffix[4:]), 1)
+
+async def lock_partition_maintenance(db: AsyncSession) -> None:
+    await db.execute(text("SELECT pg_advisory_xact_lock(hashtext('partition_maintenance'))"))
+
+async def get_partition_names(db: AsyncSession, table: str) -> List[str]:
+    result = await db.execute(
+        text("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:table AS regclass)
+            ORDER BY c.relname
+        """),
+        {"table": table}
+    )
+    return list(result.scalars().all())
+
+async def create_partition(db: AsyncSession, table: str, month: date) -> None:
+    await db.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {get_partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+    ))
+
+async def detach_partition(db: AsyncSession, table: str, name: str, drop: bool = False) -> None:
+    await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+    if drop:
+        await db.execute(text(f"DROP TABLE {name}"))
+        return
+    
+    # an archived partition must not keep pointing at live rows it no longer travels with
+    result = await db.execute(
+        text("SELECT conname FROM pg_constraint WHERE conrelid = CAST(:name AS regclass) AND contype = 'f'"),
+        {"name": name}
+    )
+    for constraint in result.scalars().all():
+        await db.execute(text(f"ALTER TABLE {name} DROP CONSTRAINT {constraint}"))
+
+async def stream_partition_rows(db: AsyncSession, name: str, batch_size: int) -> AsyncIterator[Any]:
+    result = await db.stream(
+        text(f"SELECT row_to_json(p)::text FROM {name} p ORDER BY p.id"),
+        execution_options={"yield_per": batch_size}
+    )
+    async for row in result:
+        yield row[0]
@@ -1,8 +1,28 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, case, cast, tuple_, Float, text
+from sqlalchemy.dialects.postgresql import insert
 
 from app.models.question import Question
+from app.models.question_stat import QuestionStat
+from app.models.answer import Answer
+
+CALIBRATION_MIN_ATTEMPTS = 30
+CALIBRATION_EASY_ACCURACY = 0.75
+CALIBRATION_HARD_ACCURACY = 0.4
+DUPLICATE_SIMILARITY_THRESHOLD = 0.6
+DUPLICATE_MATCH_LIMIT = 3
+
+def effective_difficulty():
+    accuracy = cast(QuestionStat.correct_count, Float) / QuestionStat.attempts
+    return case(
+        (Question.difficulty_locked, Question.difficulty),
+        (QuestionStat.attempts.is_(None), Question.difficulty),
+        (QuestionStat.attempts < CALIBRATION_MIN_ATTEMPTS, Question.difficulty),
+        (accuracy >= CALIBRATION_EASY_ACCURACY, "easy"),
+        (accuracy < CALIBRATION_HARD_ACCURACY, "hard"),
+        else_="medium"
+    )
 
 async def create_question(
     db: AsyncSession,
@@ -27,12 +47,71 @@ async def create_question(
     await db.refresh(question)
     return question
 
+async def get_question_pool_entries(db: AsyncSession) -> List[Tuple[int, str, str]]:
+    result = await db.execute(
+        select(Question.id, Question.subject, effective_difficulty())
+        .outerjoin(QuestionStat, QuestionStat.question_id == Question.id)
+    )
+    return [tuple(row) for row in result.all()]
+
+async def get_question_pool_entry(db: AsyncSession, question_id: int) -> Optional[Tuple[int, str, str]]:
+    result = await db.execute(
+        select(Question.id, Question.subject, effective_difficulty())
+        .outerjoin(QuestionStat, QuestionStat.question_id == Question.id)
+        .where(Question.id == question_id)
+    )
+    row = result.one_or_none()
+    return tuple(row) if row else None
+
+async def bulk_insert_questions(db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+    if not rows:
+        return 0
+    await db.execute(insert(Question), rows)
+    return len(rows)
+
+async def find_similar_questions(
+    db: AsyncSession,
+    question_texts: List[str],
+    threshold: float = DUPLICATE_SIMILARITY_THRESHOLD
+) -> Dict[int, List[int]]:
+    if not question_texts:
+        return {}
+    
+    result = await db.execute(
+        text("""
+            SELECT candidate.position - 1 AS position, match.id
+            FROM unnest(CAST(:question_texts AS text[]))
+                WITH ORDINALITY AS candidate(question_text, position)
+            CROSS JOIN LATERAL (
+                SELECT q.id, similarity(q.question_text, candidate.question_text) AS score
+                FROM questions q
+                WHERE q.question_text % candidate.question_text
+                ORDER BY score DESC
+                LIMIT :match_limit
+            ) AS match
+            WHERE match.score >= :threshold
+            ORDER BY position, match.score DESC
+        """),
+        {
+            "question_texts": question_texts,
+            "match_limit": DUPLICATE_MATCH_LIMIT,
+            "threshold": threshold
+        }
+    )
+    
+    matches: Dict[int, List[int]] = {}
+    for position, question_id in result.all():
+        matches.setdefault(position, []).append(question_id)
+    return matches
+
 async def get_questions_with_filters(
     db: AsyncSession,
     subject: Optional[str] = None,
     difficulty: Optional[str] = None,
     limit: int = 50,
-    offset: int = 0
+    offset: int = 0,
+    after_id: Optional[int] = None,
+    search: Optional[str] = None
 ) -> List[Question]:
     query = select(Question)
     
@@ -42,7 +121,17 @@ async def get_questions_with_filters(
     if difficulty:
         query = query.where(Question.difficulty == difficulty)
     
-    query = query.offset(offset).limit(limit)
+    if search:
+        query = query.where(
+            Question.search_vector.op("@@")(func.websearch_to_tsquery("english", search))
+        )
+    
+    if after_id is not None:
+        query = query.where(Question.id > after_id)
+    else:
+        query = query.offset(offset)
+    
+    query = query.order_by(Question.id).limit(limit)
     
     result = await db.execute(query)
     return result.scalars().all()
@@ -59,13 +148,15 @@ async def update_question(
     options: List[str],
     correct_answer: str,
     difficulty: str,
-    points: int
+    points: int,
+    difficulty_locked: bool
 ) -> Question:
     question.subject = subject
     question.question_text = question_text
     question.options = options
     question.correct_answer = correct_answer
     question.difficulty = difficulty
+    question.difficulty_locked = difficulty_locked
     question.points = points
     
     await db.commit()
@@ -76,32 +167,105 @@ async def delete_question(db: AsyncSession, question: Question) -> None:
     await db.delete(question)
     await db.commit()
 
-async def get_distinct_subjects(db: AsyncSession) -> List[str]:
+async def get_subject_question_counts(db: AsyncSession) -> Dict[str, int]:
     result = await db.execute(
-        select(Question.subject).distinct().order_by(Question.subject)
-    )
-    return [row[0] for row in result.all()]
-
-async def get_question_stats(db: AsyncSession) -> dict:
-    total_result = await db.execute(select(func.count(Question.id)))
-    total_count = total_result.scalar()
-    
-    subject_result = await db.execute(
         select(Question.subject, func.count(Question.id))
         .group_by(Question.subject)
         .order_by(Question.subject)
     )
-    by_subject = {subject: count for subject, count in subject_result.all()}
-    
-    difficulty_result = await db.execute(
-        select(Question.difficulty, func.count(Question.id))
-        .group_by(Question.difficulty)
-        .order_by(Question.difficulty)
+    return {subject: count for subject, count in result.all()}
+
+async def get_question_performance(db: AsyncSession, question_id: int) -> Optional[Dict[str, Any]]:
+    result = await db.execute(
+        select(
+            Question.id,
+            Question.difficulty,
+            effective_difficulty().label("calibrated_difficulty"),
+            func.coalesce(QuestionStat.attempts, 0).label("attempts"),
+            func.coalesce(QuestionStat.correct_count, 0).label("correct_count"),
+            func.coalesce(QuestionStat.response_time_sum, 0.0).label("response_time_sum"),
+            func.coalesce(QuestionStat.response_time_sq_sum, 0.0).label("response_time_sq_sum")
+        )
+        .outerjoin(QuestionStat, QuestionStat.question_id == Question.id)
+        .where(Question.id == question_id)
+    )
+    row = result.one_or_none()
+    return dict(row._mapping) if row else None
+
+async def rebuild_question_stats(db: AsyncSession) -> int:
+    aggregates = (
+        select(
+            Answer.question_id,
+            func.count(Answer.id),
+            func.count(Answer.id).filter(Answer.is_correct),
+            func.sum(Answer.response_time),
+            func.sum(Answer.response_time * Answer.response_time)
+        )
+        .group_by(Answer.question_id)
+    )
+    stmt = insert(QuestionStat).from_select(
+        ["question_id", "attempts", "correct_count", "response_time_sum", "response_time_sq_sum"],
+        aggregates
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[QuestionStat.question_id],
+        set_={
+            "attempts": stmt.excluded.attempts,
+            "correct_count": stmt.excluded.correct_count,
+            "response_time_sum": stmt.excluded.response_time_sum,
+            "response_time_sq_sum": stmt.excluded.response_time_sq_sum,
+            "updated_at": func.now()
+        }
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount
+
+async def get_question_counts(db: AsyncSession) -> Dict[str, Any]:
+    result = await db.execute(
+        select(
+            Question.subject,
+            Question.difficulty,
+            func.count(Question.id),
+            func.grouping(Question.subject, Question.difficulty)
+        ).group_by(
+            func.grouping_sets(tuple_(Question.subject), tuple_(Question.difficulty), tuple_())
+        )
     )
-    by_difficulty = {difficulty: count for difficulty, count in difficulty_result.all()}
+    
+    total_count = 0
+    by_subject = {}
+    by_difficulty = {}
+    for subject, difficulty, count, grouping in result.all():
+        if grouping == 1:
+            by_subject[subject] = count
+        elif grouping == 2:
+            by_difficulty[difficulty] = count
+        else:
+            total_count = count
     
     return {
         "total_questions": total_count,
         "by_subject": by_subject,
         "by_difficulty": by_difficulty
+    }
+
+async def get_performance_by_difficulty(db: AsyncSession) -> Dict[str, Dict[str, float]]:
+    result = await db.execute(
+        select(
+            Question.difficulty,
+            func.sum(QuestionStat.attempts),
+            func.sum(QuestionStat.correct_count),
+            func.sum(QuestionStat.response_time_sum)
+        )
+        .join(QuestionStat, QuestionStat.question_id == Question.id)
+        .group_by(Question.difficulty)
+        .order_by(Question.difficulty)
+    )
+    return {
+        difficulty: {
+            "attempts": attempts,
+            "accuracy": correct / attempts if attempts else 0,
+            "average_response_time": response_time_sum / attempts if attempts else 0
+        } for difficulty, attempts, correct, response_time_sum in result.all()
     } 
\ No newline at end of file
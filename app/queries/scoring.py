@@ -1,10 +1,21 @@
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, and_, func, text
+from sqlalchemy.dialects.postgresql import insert
 
+from app.models.game import Game
 from app.models.game_session import GameSession
 from app.models.answer import Answer
+from app.models.question_stat import QuestionStat
+
+# the highest team total wins, ties go to the lowest team id
+WINNER_TEAM_ORDER = "total DESC, team_id"
+
+def get_winner_team_id(team_scores: Dict[int, float]) -> Optional[int]:
+    if not team_scores:
+        return None
+    return min(team_scores, key=lambda team_id: (-team_scores[team_id], team_id))
 
 async def get_game_session(
     db: AsyncSession,
@@ -15,63 +26,275 @@ async def get_game_session(
         select(GameSession).where(
             and_(
                 GameSession.game_id == game_id,
-                GameSession.user_id == user_id
+                GameSession.user_id == user_id,
+                GameSession.game_created_at == select(Game.created_at).where(Game.id == game_id).scalar_subquery()
             )
         )
     )
     return result.scalar_one_or_none()
 
-async def create_answer(
-    db: AsyncSession,
-    game_session_id: int,
-    question_id: int,
-    user_answer: str,
-    is_correct: bool,
-    response_time: float,
-    points_earned: float
-) -> Answer:
-    answer = Answer(
-        game_session_id=game_session_id,
-        question_id=question_id,
-        user_answer=user_answer,
-        is_correct=is_correct,
-        response_time=response_time,
-        points_earned=points_earned
+async def insert_answers(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[Any]:
+    if not rows:
+        return []
+    stmt = insert(Answer).values(rows).on_conflict_do_nothing(
+        index_elements=[Answer.game_session_id, Answer.question_id, Answer.game_created_at]
+    ).returning(
+        Answer.game_session_id,
+        Answer.game_created_at,
+        Answer.question_id,
+        Answer.is_correct,
+        Answer.response_time,
+        Answer.points_earned
     )
-    db.add(answer)
-    return answer
+    result = await db.execute(stmt)
+    return result.all()
 
-async def update_game_session_stats(
-    db: AsyncSession,
-    game_session: GameSession,
-    points_earned: float,
-    response_time: float,
-    is_correct: bool
-) -> None:
-    game_session.total_score += points_earned
-    game_session.total_answers += 1
-    
-    if is_correct:
-        game_session.correct_answers += 1
-    
-    total_time = game_session.average_response_time * (game_session.total_answers - 1)
-    game_session.average_response_time = (total_time + response_time) / game_session.total_answers
-    
-    await db.commit()
+async def record_question_attempts(db: AsyncSession, attempts: List[Dict[str, Any]]) -> None:
+    if not attempts:
+        return
+    stmt = insert(QuestionStat).values(attempts)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[QuestionStat.question_id],
+        set_={
+            "attempts": QuestionStat.attempts + stmt.excluded.attempts,
+            "correct_count": QuestionStat.correct_count + stmt.excluded.correct_count,
+            "response_time_sum": QuestionStat.response_time_sum + stmt.excluded.response_time_sum,
+            "response_time_sq_sum": QuestionStat.response_time_sq_sum + stmt.excluded.response_time_sq_sum,
+            "updated_at": func.now()
+        }
+    )
+    await db.execute(stmt)
+
+async def apply_game_session_deltas(db: AsyncSession, deltas: List[Dict[str, Any]]) -> None:
+    if not deltas:
+        return
+    await db.execute(
+        text("""
+            UPDATE game_sessions AS gs SET
+                total_score = gs.total_score + v.points,
+                correct_answers = gs.correct_answers + v.correct,
+                total_answers = gs.total_answers + v.answers,
+                average_response_time = (
+                    gs.average_response_time * gs.total_answers + v.response_time
+                ) / (gs.total_answers + v.answers)
+            FROM unnest(
+                CAST(:ids AS integer[]),
+                CAST(:game_created_at AS timestamptz[]),
+                CAST(:points AS float8[]),
+                CAST(:correct AS integer[]),
+                CAST(:answers AS integer[]),
+                CAST(:response_time AS float8[])
+            ) AS v(id, game_created_at, points, correct, answers, response_time)
+            WHERE gs.id = v.id AND gs.game_created_at = v.game_created_at
+        """),
+        {
+            "ids": [delta["game_session_id"] for delta in deltas],
+            "game_created_at": [delta["game_created_at"] for delta in deltas],
+            "points": [delta["points"] for delta in deltas],
+            "correct": [delta["correct"] for delta in deltas],
+            "answers": [delta["answers"] for delta in deltas],
+            "response_time": [delta["response_time"] for delta in deltas]
+        }
+    )
 
-async def get_game_session_with_answers(
+async def get_user_game_stats_row(
     db: AsyncSession,
     user_id: int,
     game_id: int
-) -> Optional[GameSession]:
+) -> Optional[Any]:
     result = await db.execute(
-        select(GameSession).options(
-            selectinload(GameSession.answers)
-        ).where(
-            and_(
-                GameSession.user_id == user_id,
-                GameSession.game_id == game_id
+        text("""
+            SELECT g.status, gs.total_score, gs.correct_answers, gs.total_answers,
+                   gs.average_response_time,
+                   coalesce((
+                       SELECT json_agg(json_build_object(
+                           'question_id', a.question_id,
+                           'user_answer', a.user_answer,
+                           'is_correct', a.is_correct,
+                           'points_earned', a.points_earned,
+                           'response_time', a.response_time
+                       ) ORDER BY a.id)
+                       FROM answers a
+                       WHERE a.game_session_id = gs.id AND a.game_created_at = gs.game_created_at
+                   ), '[]') AS answers
+            FROM game_sessions gs
+            JOIN games g ON g.id = gs.game_id
+            WHERE gs.user_id = :user_id AND gs.game_id = :game_id
+              AND gs.game_created_at = (SELECT created_at FROM games WHERE id = :game_id)
+        """),
+        {"user_id": user_id, "game_id": game_id}
+    )
+    return result.first()
+
+async def get_finished_answers_chunk(
+    db: AsyncSession,
+    after_id: int,
+    limit: int
+) -> List[Any]:
+    result = await db.execute(
+        text("""
+            SELECT a.id, a.game_session_id, a.is_correct, a.response_time,
+                   a.points_earned, q.points
+            FROM answers a
+            JOIN questions q ON q.id = a.question_id
+            JOIN game_sessions gs ON gs.id = a.game_session_id AND gs.game_created_at = a.game_created_at
+            JOIN games g ON g.id = gs.game_id
+            WHERE a.id > :after_id AND g.status = 'FINISHED'
+            ORDER BY a.id
+            LIMIT :limit
+        """),
+        {"after_id": after_id, "limit": limit}
+    )
+    return result.all()
+
+async def update_answer_points(db: AsyncSession, answer_ids: List[int], points: List[float]) -> None:
+    if not answer_ids:
+        return
+    await db.execute(
+        text("""
+            UPDATE answers AS a SET points_earned = v.points
+            FROM unnest(CAST(:ids AS integer[]), CAST(:points AS float8[])) AS v(id, points)
+            WHERE a.id = v.id
+        """),
+        {"ids": answer_ids, "points": points}
+    )
+
+async def refresh_session_and_user_scores(db: AsyncSession, game_session_ids: List[int]) -> List[Any]:
+    if not game_session_ids:
+        return []
+    result = await db.execute(
+        text(f"""
+            WITH totals AS (
+                SELECT game_session_id, game_created_at, sum(points_earned) AS total
+                FROM answers
+                WHERE game_session_id = ANY(CAST(:ids AS integer[]))
+                GROUP BY game_session_id, game_created_at
+            ), changes AS (
+                SELECT gs.id, gs.game_created_at, gs.game_id, gs.user_id, t.total,
+                       t.total - gs.total_score AS delta
+                FROM game_sessions gs
+                JOIN totals t ON t.game_session_id = gs.id AND t.game_created_at = gs.game_created_at
+                WHERE gs.total_score IS DISTINCT FROM t.total
+            ), session_updates AS (
+                UPDATE game_sessions gs SET total_score = c.total
+                FROM changes c
+                WHERE gs.id = c.id AND gs.game_created_at = c.game_created_at
+                RETURNING gs.game_id, gs.user_id
+            ), team_totals AS (
+                SELECT t.id AS team_id, t.game_id, coalesce(t.is_winner, false) AS was_winner,
+                       coalesce(sum(coalesce(c.total, gs.total_score)), 0) AS total
+                FROM teams t
+                LEFT JOIN team_members tm ON tm.team_id = t.id
+                LEFT JOIN game_sessions gs ON gs.game_id = t.game_id AND gs.user_id = tm.user_id
+                LEFT JOIN changes c ON c.id = gs.id
+                WHERE t.game_id IN (SELECT game_id FROM changes)
+                GROUP BY t.id, t.game_id, t.is_winner
+            ), team_results AS (
+                SELECT tt.team_id, tt.game_id, tt.was_winner, tt.total,
+                       coalesce((
+                           SELECT max(o.total) FROM team_totals o
+                           WHERE o.game_id = tt.game_id AND o.team_id <> tt.team_id
+                       ), 0) AS opponent_score,
+                       tt.team_id = first_value(tt.team_id) OVER (
+                           PARTITION BY tt.game_id ORDER BY {WINNER_TEAM_ORDER}
+                       ) AS is_winner
+                FROM team_totals tt
+            ), team_updates AS (
+                UPDATE teams t SET total_score = r.total, is_winner = r.is_winner
+                FROM team_results r
+                WHERE t.id = r.team_id
+                RETURNING t.id
+            ), summary_updates AS (
+                UPDATE user_game_summaries s SET
+                    total_score = coalesce((
+                        SELECT c.total FROM changes c
+                        WHERE c.game_id = s.game_id AND c.user_id = s.user_id
+                    ), s.total_score),
+                    team_score = r.total,
+                    opponent_score = r.opponent_score,
+                    is_winner = r.is_winner
+                FROM team_results r
+                WHERE s.game_id = r.game_id AND s.team_id = r.team_id
+                RETURNING s.user_id
+            ), member_wins AS (
+                SELECT tm.user_id, r.game_id, r.is_winner::int - r.was_winner::int AS delta
+                FROM team_results r
+                JOIN team_members tm ON tm.team_id = r.team_id
+                WHERE r.is_winner <> r.was_winner
+            ), user_deltas AS (
+                SELECT user_id, sum(score_delta) AS score_delta, sum(win_delta) AS win_delta
+                FROM (
+                    SELECT user_id, delta AS score_delta, 0 AS win_delta FROM changes
+                    UNION ALL
+                    SELECT user_id, 0, delta FROM member_wins
+                ) d
+                GROUP BY user_id
+            ), user_updates AS (
+                UPDATE users u SET
+                    total_score = u.total_score + d.score_delta,
+                    total_wins = u.total_wins + d.win_delta
+                FROM user_deltas d
+                WHERE u.id = d.user_id
+                RETURNING u.id
+            ), subject_deltas AS (
+                SELECT d.user_id, g.subject, sum(d.score_delta) AS score_delta, sum(d.win_delta) AS win_delta
+                FROM (
+                    SELECT user_id, game_id, delta AS score_delta, 0 AS win_delta FROM changes
+                    UNION ALL
+                    SELECT user_id, game_id, 0, delta FROM member_wins
+                ) d
+                JOIN games g ON g.id = d.game_id
+                GROUP BY d.user_id, g.subject
+            ), subject_updates AS (
+                UPDATE user_subject_stats st SET
+                    total_score = st.total_score + d.score_delta,
+                    games_won = st.games_won + d.win_delta,
+                    updated_at = now()
+                FROM subject_deltas d
+                WHERE st.user_id = d.user_id AND st.subject = d.subject
+                RETURNING st.user_id
+            ), game_updates AS (
+                UPDATE games g SET rescored_at = now()
+                WHERE g.id IN (
+                    SELECT game_id FROM game_sessions WHERE id = ANY(CAST(:ids AS integer[]))
+                )
+                RETURNING g.id
             )
-        )
+            SELECT game_id, user_id FROM session_updates
+        """),
+        {"ids": game_session_ids}
+    )
+    return result.all()
+
+async def get_reconcilable_game_ids(
+    db: AsyncSession,
+    after_id: int,
+    limit: int,
+    finished_since: datetime
+) -> List[int]:
+    result = await db.execute(
+        text("""
+            SELECT id FROM games
+            WHERE id > :after_id
+              AND (status = 'IN_PROGRESS' OR (status = 'FINISHED' AND end_time >= :finished_since))
+            ORDER BY id
+            LIMIT :limit
+        """),
+        {"after_id": after_id, "limit": limit, "finished_since": finished_since}
+    )
+    return list(result.scalars().all())
+
+async def get_durable_scores(db: AsyncSession, game_ids: List[int]) -> List[Any]:
+    if not game_ids:
+        return []
+    result = await db.execute(
+        text("""
+            SELECT gs.game_id, t.id AS team_id, gs.user_id, gs.total_score
+            FROM game_sessions gs
+            LEFT JOIN (teams t JOIN team_members tm ON tm.team_id = t.id)
+                   ON t.game_id = gs.game_id AND tm.user_id = gs.user_id
+            WHERE gs.game_id = ANY(CAST(:ids AS integer[]))
+        """),
+        {"ids": game_ids}
     )
-    return result.scalar_one_or_none()
\ No newline at end of file
+    return result.all()
\ No newline at end of file
@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, desc, func, tuple_, text
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.user_game_summary import UserGameSummary
+from app.models.user_subject_stat import UserSubjectStat
+
+async def get_user_game_summaries(
+    db: AsyncSession,
+    user_id: int,
+    limit: int,
+    after: Optional[Tuple[datetime, int]] = None
+) -> List[UserGameSummary]:
+    query = select(UserGameSummary).where(UserGameSummary.user_id == user_id)
+    
+    if after:
+        query = query.where(
+            tuple_(UserGameSummary.finished_at, UserGameSummary.game_id) < tuple_(*after)
+        )
+    
+    result = await db.execute(
+        query
+        .order_by(desc(UserGameSummary.finished_at), desc(UserGameSummary.game_id))
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+async def get_user_subject_stats(db: AsyncSession, user_id: int) -> List[UserSubjectStat]:
+    result = await db.execute(
+        select(UserSubjectStat)
+        .where(UserSubjectStat.user_id == user_id)
+        .order_by(desc(UserSubjectStat.games_played), UserSubjectStat.subject)
+    )
+    return result.scalars().all()
+
+async def increment_user_subject_stats(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    if not rows:
+        return
+    stmt = insert(UserSubjectStat).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserSubjectStat.user_id, UserSubjectStat.subject],
+        set_={
+            "games_played": UserSubjectStat.games_played + stmt.excluded.games_played,
+            "games_won": UserSubjectStat.games_won + stmt.excluded.games_won,
+            "total_score": UserSubjectStat.total_score + stmt.excluded.total_score,
+            "correct_answers": UserSubjectStat.correct_answers + stmt.excluded.correct_answers,
+            "total_answers": UserSubjectStat.total_answers + stmt.excluded.total_answers,
+            "response_time_sum": UserSubjectStat.response_time_sum + stmt.excluded.response_time_sum,
+            "updated_at": func.now()
+        }
+    )
+    await db.execute(stmt)
+
+async def lock_user_subject_stats(db: AsyncSession, exclusive: bool = False) -> None:
+    lock = "pg_advisory_xact_lock" if exclusive else "pg_advisory_xact_lock_shared"
+    await db.execute(text(f"SELECT {lock}(hashtext('user_subject_stats'))"))
+
+async def rebuild_user_subject_stats(db: AsyncSession) -> int:
+    await lock_user_subject_stats(db, exclusive=True)
+    await db.execute(delete(UserSubjectStat))
+    
+    aggregates = (
+        select(
+            UserGameSummary.user_id,
+            UserGameSummary.subject,
+            func.count(),
+            func.count().filter(UserGameSummary.is_winner),
+            func.sum(UserGameSummary.total_score),
+            func.sum(UserGameSummary.correct_answers),
+            func.sum(UserGameSummary.total_answers),
+            func.sum(UserGameSummary.response_time_sum)
+        )
+        .group_by(UserGameSummary.user_id, UserGameSummary.subject)
+    )
+    result = await db.execute(
+        insert(UserSubjectStat).from_select(
+            ["user_id", "subject", "games_played", "games_won", "total_score",
+             "correct_answers", "total_answers", "response_time_sum"],
+            aggregates
+        )
+    )
+    await db.commit()
+    return result.rowcount
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+import redis.asyncio as redis
+
+from app.database import get_db, get_redis, get_pool_metrics
+from app.models.user import User
+from app.routers.auth import get_current_admin_user
+from app.schemas.user import UserFlagsUpdate, UserPrincipal
+from app.services import auth as auth_service
+from app.services.score_reconciliation import get_score_reconciliation_metrics
+from app.utils.auth import get_password_hash_metrics
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.get("/metrics/password-hashing")
+async def get_password_hashing_metrics(
+    current_user: User = Depends(get_current_admin_user)
+):
+    return get_password_hash_metrics()
+
+@router.get("/metrics/db-pool")
+async def get_db_pool_metrics(
+    current_user: User = Depends(get_current_admin_user)
+):
+    return get_pool_metrics()
+
+@router.get("/metrics/score-reconciliation")
+async def get_score_reconciliation(
+    current_user: User = Depends(get_current_admin_user),
+    redis_client: redis.Redis = Depends(get_redis)
+):
+    return await get_score_reconciliation_metrics(redis_client)
+
+@router.patch("/users/{user_id}", response_model=UserPrincipal)
+async def update_user_flags(
+    user_id: int,
+    flags: UserFlagsUpdate,
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis)
+):
+    return await auth_service.update_user_flags(db, redis_client, user_id, flags)
@@ -1,36 +1,47 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
+import redis.asyncio as redis
 
-from app.database import get_db
-from app.schemas.user import UserCreate, UserResponse, Token, UserLogin
+from app.database import get_db, get_redis
+from app.schemas.user import UserCreate, UserResponse, UserPrincipal, Token, UserLogin
 from app.services import auth as auth_service
-from app.utils.auth import verify_token
+from app.utils.auth import decode_access_token, get_token_user_id
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> UserResponse:
-    username = verify_token(token)
-    return await auth_service.get_current_user(db, username)
+    db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis)
+) -> UserPrincipal:
+    payload = decode_access_token(token)
+    user_id = get_token_user_id(payload)
+    if user_id is None:
+        user = await auth_service.get_current_user(db, payload["sub"])
+        user_id = user.id
+    
+    principal = await auth_service.get_user_principal(db, redis_client, user_id)
+    
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+    
+    return principal
 
 async def get_current_admin_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> UserResponse:
-    username = verify_token(token)
-    user = await auth_service.get_current_user(db, username)
-    
-    if not user.is_admin:
+    current_user: UserPrincipal = Depends(get_current_user)
+) -> UserPrincipal:
+    if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin privileges required"
         )
     
-    return user
+    return current_user
 
 @router.post("/register", response_model=UserResponse)
 async def register_user(
@@ -65,6 +76,7 @@ async def login_user_json(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: UserResponse = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    return current_user
\ No newline at end of file
+    return await auth_service.get_user_profile(db, current_user.id)
\ No newline at end of file
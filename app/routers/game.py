@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, HTTPException, Response, status, WebSocket, WebSocketDisconnect
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis
 import json
-from app.database import get_db, get_redis
+from app.database import get_db, get_read_db, get_redis
 from app.models.user import User
 from app.routers.auth import get_current_user
 from app.schemas.question import AnswerSubmission, AnswerResponse, QuestionResponse
@@ -26,7 +26,7 @@ router = APIRouter(prefix="/game", tags=["game"])
 async def get_game(
     game_id: int,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     redis_client: redis.Redis = Depends(get_redis)
 ):
     
@@ -102,9 +102,10 @@ async def submit_answer_endpoint(
             response_time=answer_data.response_time
         )
         
-        await broadcast_score_update(redis_client, game_id, current_user.id, result)
-        
-        await notify_team_mate_answer(redis_client, game_id, current_user.id, result)
+        if not result.pop("duplicate", False):
+            await broadcast_score_update(redis_client, game_id, current_user.id, result)
+            
+            await notify_team_mate_answer(redis_client, game_id, current_user.id, result)
         
         return {
             "success": True,
@@ -127,11 +128,12 @@ async def submit_answer_endpoint(
 async def get_user_stats(
     game_id: int,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    redis_client: redis.Redis = Depends(get_redis)
 ):
     
     try:
-        stats = await get_user_game_stats(db, current_user.id, game_id)
+        stats = await get_user_game_stats(db, redis_client, current_user.id, game_id)
         
         if not stats:
             raise HTTPException(
@@ -139,10 +141,7 @@ async def get_user_stats(
                 detail="Game session not found"
             )
         
-        return {
-            "success": True,
-            "stats": stats
-        }
+        return Response(content=stats, media_type="application/json")
         
     except HTTPException:
         raise
@@ -157,7 +156,7 @@ async def get_user_stats(
 async def get_game_results(
     game_id: int,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     redis_client: redis.Redis = Depends(get_redis)
 ):
     
@@ -224,14 +223,19 @@ async def websocket_endpoint(
     
     try:
         # Verify token and get user
-        from app.utils.auth import verify_token
-        from sqlalchemy import select
+        from app.utils.auth import decode_access_token, get_token_user_id
+        from app.services.auth import get_current_user as get_user_by_username, get_user_principal
         
-        username = verify_token(token)
-        result = await db.execute(select(User).where(User.username == username))
-        user = result.scalar_one_or_none()
+        try:
+            payload = decode_access_token(token)
+            user_id = get_token_user_id(payload)
+            if user_id is None:
+                user_id = (await get_user_by_username(db, payload["sub"])).id
+            user = await get_user_principal(db, redis_client, user_id)
+        except HTTPException:
+            user = None
         
-        if not user:
+        if not user or not user.is_active:
             await websocket.close(code=4001, reason="Invalid token")
             return
         
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 import redis.asyncio as redis
-from app.database import get_db, get_redis
+from app.database import get_read_db, get_redis
 from app.services.leaderboard import (
     get_global_leaderboard,
-    get_location_leaderboard
+    get_location_leaderboard,
+    get_period_leaderboard
 )
 
 router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
@@ -13,12 +15,13 @@ router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
 async def get_global_leaderboard_endpoint(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page, overrides page"),
+    db: AsyncSession = Depends(get_read_db),
     redis_client: redis.Redis = Depends(get_redis)
 ):
     try:
         leaderboard_data = await get_global_leaderboard(
-            db, redis_client, page, page_size
+            db, redis_client, page, page_size, cursor
         )
         
         return {
@@ -26,6 +29,11 @@ async def get_global_leaderboard_endpoint(
             **leaderboard_data
         }
         
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -37,12 +45,13 @@ async def get_location_leaderboard_endpoint(
     country: str,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page, overrides page"),
+    db: AsyncSession = Depends(get_read_db),
     redis_client: redis.Redis = Depends(get_redis)
 ):
     try:
         leaderboard_data = await get_location_leaderboard(
-            db, redis_client, country, page, page_size
+            db, redis_client, country, page, page_size, cursor
         )
         
         return {
@@ -50,8 +59,42 @@ async def get_location_leaderboard_endpoint(
             **leaderboard_data
         }
         
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get location leaderboard: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+@router.get("/period/{period}", response_model=dict)
+async def get_period_leaderboard_endpoint(
+    period: str,
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(50, ge=1, le=100, description="Items per page"),
+    db: AsyncSession = Depends(get_read_db),
+    redis_client: redis.Redis = Depends(get_redis)
+):
+    try:
+        leaderboard_data = await get_period_leaderboard(
+            db, redis_client, period, page, page_size
+        )
+        
+        return {
+            "success": True,
+            **leaderboard_data
+        }
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get {period} leaderboard: {str(e)}"
+        )
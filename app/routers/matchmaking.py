@@ -8,7 +8,8 @@ from app.routers.auth import get_current_user
 from app.schemas.game import MatchmakingRequest, MatchmakingResponse
 from app.services.matchmaking import (
     join_matchmaking_queue,
-    leave_matchmaking_queue
+    leave_matchmaking_queue,
+    get_matchmaking_subjects
 )
 
 router = APIRouter(prefix="/matchmaking", tags=["matchmaking"])
@@ -35,6 +36,11 @@ async def join_queue(
             **result
         }
         
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -68,20 +74,15 @@ async def leave_queue(
         )
 
 @router.get("/available-subjects")
-async def get_available_subjects():
-    subjects = [
-        "Mathematics",
-        "Science",
-        "History", 
-        "Geography",
-        "Literature",
-        "Sports",
-        "Technology",
-        "Art",
-        "Music",
-        "General Knowledge"
-    ]
+async def get_available_subjects(
+    db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis)
+):
     
-    return {
-        "subjects": subjects
-    } 
\ No newline at end of file
+    try:
+        return await get_matchmaking_subjects(db, redis_client)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get subjects: {str(e)}"
+        )
\ No newline at end of file
@@ -1,61 +1,118 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+import redis.asyncio as redis
+import io
 
-from app.database import get_db
+from app.database import get_db, get_read_db, get_redis
 from app.models.user import User
 from app.routers.auth import get_current_user, get_current_admin_user
-from app.schemas.question import QuestionCreate, QuestionResponse
+from app.schemas.question import QuestionCreate, QuestionResponse, QuestionCreateResponse
 from app.services import questions as question_service
+from app.services import question_import as question_import_service
 
 router = APIRouter(prefix="/questions", tags=["questions"])
 
-@router.post("/create-question", response_model=QuestionResponse)
+@router.post("/create-question", response_model=QuestionCreateResponse)
 async def create_question(
     question_data: QuestionCreate,
     current_user: User = Depends(get_current_admin_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis)
 ):
-    return await question_service.create_question(db, question_data)
+    return await question_service.create_question(db, redis_client, question_data)
+
+@router.post("/bulk-import")
+async def bulk_import_questions(
+    file: UploadFile = File(..., description="NDJSON or CSV file of questions"),
+    format: Optional[str] = Query(None, description="ndjson or csv, detected from the file name if omitted"),
+    dry_run: bool = Query(False, description="Validate and roll back without importing"),
+    skip_duplicates: bool = Query(False, description="Skip rows that closely match an existing question"),
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis)
+):
+    import_format = format or question_import_service.detect_import_format(file.filename or "")
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    
+    try:
+        return await question_import_service.import_questions(
+            db, redis_client, stream, import_format, dry_run, skip_duplicates
+        )
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import questions: {str(e)}"
+        )
+    finally:
+        stream.detach()
 
 @router.get("/get-questions", response_model=List[QuestionResponse])
 async def get_questions(
+    response: Response,
     subject: Optional[str] = Query(None, description="Filter by subject"),
     difficulty: Optional[str] = Query(None, description="Filter by difficulty"),
+    search: Optional[str] = Query(None, description="Full-text search over question text"),
     limit: int = Query(50, ge=1, le=100, description="Number of questions to return"),
     offset: int = Query(0, ge=0, description="Number of questions to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor, overrides offset"),
     current_user: User = Depends(get_current_admin_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return await question_service.get_questions(db, subject, difficulty, limit, offset)
+    questions = await question_service.get_questions(
+        db, subject, difficulty, limit, offset, cursor, search
+    )
+    
+    next_cursor = question_service.get_next_question_cursor(questions, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    
+    return questions
 
 @router.get("/subjects/available")
 async def get_available_subjects(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis)
 ):
-    subjects = await question_service.get_available_subjects(db)
+    subjects = await question_service.get_available_subjects(db, redis_client)
     return {"subjects": subjects}
 
 @router.get("/stats/count")
 async def get_question_stats(
     current_user: User = Depends(get_current_admin_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis)
+):
+    return await question_service.get_question_statistics(db, redis_client)
+
+@router.get("/{question_id}/stats")
+async def get_question_performance(
+    question_id: int,
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return await question_service.get_question_statistics(db)
+    return await question_service.get_question_performance(db, question_id)
 
 @router.put("/{question_id}", response_model=QuestionResponse)
 async def update_question(
     question_id: int,
     question_data: QuestionCreate,
     current_user: User = Depends(get_current_admin_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis)
 ):
-    return await question_service.update_question(db, question_id, question_data)
+    return await question_service.update_question(db, redis_client, question_id, question_data)
 
 @router.delete("/{question_id}")
 async def delete_question(
     question_id: int,
     current_user: User = Depends(get_current_admin_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis)
 ):
-    return await question_service.delete_question(db, question_id) 
\ No newline at end of file
+    return await question_service.delete_question(db, redis_client, question_id) 
\ No newline at end of file
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.database import get_read_db
+from app.routers.auth import get_current_user
+from app.schemas.user import UserPrincipal
+from app.services.users import get_user_game_history, get_user_profile_stats
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+@router.get("/me/games", response_model=dict)
+async def get_my_games(
+    page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    try:
+        history = await get_user_game_history(db, current_user.id, page_size, cursor)
+        
+        return {
+            "success": True,
+            **history
+        }
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get game history: {str(e)}"
+        )
+
+@router.get("/me/profile", response_model=dict)
+async def get_my_profile(
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    try:
+        profile = await get_user_profile_stats(db, current_user.id)
+        
+        return {
+            "success": True,
+            "profile": profile
+        }
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get profile: {str(e)}"
+        )
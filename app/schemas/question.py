@@ -12,6 +12,9 @@ class QuestionResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class QuestionCreateResponse(QuestionResponse):
+    possible_duplicates: List[int] = []
+
 class AnswerSubmission(BaseModel):
     question_id: int
     user_answer: str
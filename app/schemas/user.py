@@ -28,6 +28,22 @@ class UserResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class UserPrincipal(BaseModel):
+    id: int
+    username: str
+    email: str
+    country: Optional[str]
+    city: Optional[str]
+    is_active: bool
+    is_admin: bool
+    
+    class Config:
+        from_attributes = True
+
+class UserFlagsUpdate(BaseModel):
+    is_active: Optional[bool] = None
+    is_admin: Optional[bool] = None
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -0,0 +1,230 @@
+import json
+import logging
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from app.database import get_read_sessionmaker
+from app.queries import analytics as analytics_queries
+from app.config.config import Config
+
+config = Config()
+logger = logging.getLogger(__name__)
+
+ANALYTICS_EXPORT_DIR = config.ANALYTICS_EXPORT_DIR
+ANALYTICS_EXPORT_BATCH_ROWS = int(config.ANALYTICS_EXPORT_BATCH_ROWS)
+ANALYTICS_EXPORT_SETTLE_SECONDS = int(config.ANALYTICS_EXPORT_SETTLE_SECONDS)
+EXPORT_FORMATS = ("parquet", "arrow")
+WATERMARK_FILE = "_watermark.json"
+
+EXPORT_SCHEMAS = {
+    "answers": pa.schema([
+        ("answer_id", pa.int64()),
+        ("game_id", pa.int64()),
+        ("user_id", pa.int64()),
+        ("question_id", pa.int64()),
+        ("subject", pa.string()),
+        ("difficulty", pa.string()),
+        ("user_answer", pa.string()),
+        ("is_correct", pa.bool_()),
+        ("response_time", pa.float64()),
+        ("points_earned", pa.float64()),
+        ("answered_at", pa.timestamp("us", tz="UTC")),
+        ("finished_at", pa.timestamp("us", tz="UTC")),
+        ("rescored_at", pa.timestamp("us", tz="UTC")),
+    ]),
+    "game_sessions": pa.schema([
+        ("game_session_id", pa.int64()),
+        ("game_id", pa.int64()),
+        ("user_id", pa.int64()),
+        ("subject", pa.string()),
+        ("team_id", pa.int64()),
+        ("is_winner", pa.bool_()),
+        ("total_score", pa.float64()),
+        ("correct_answers", pa.int64()),
+        ("total_answers", pa.int64()),
+        ("average_response_time", pa.float64()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+        ("finished_at", pa.timestamp("us", tz="UTC")),
+        ("rescored_at", pa.timestamp("us", tz="UTC")),
+    ]),
+}
+
+def get_partition_date(row: Any) -> date:
+    return row.finished_at.astimezone(timezone.utc).date()
+
+class DatePartitionedWriter:
+    def __init__(self, export_dir: str, dataset: str, export_format: str, run_id: str) -> None:
+        self.export_dir = export_dir
+        self.dataset = dataset
+        self.export_format = export_format
+        self.run_id = run_id
+        self.schema = EXPORT_SCHEMAS[dataset]
+        self.current_date: Optional[date] = None
+        self.writer: Any = None
+        self.sink: Any = None
+        self.partial_paths: List[str] = []
+        self.rows = 0
+    
+    def open(self, partition_date: date) -> None:
+        directory = os.path.join(self.export_dir, self.dataset, f"date={partition_date.isoformat()}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{self.run_id}.{self.export_format}.partial")
+        if self.export_format == "parquet":
+            self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            self.sink = pa.OSFile(path, "wb")
+            self.writer = ipc.new_file(self.sink, self.schema)
+        self.partial_paths.append(path)
+        self.current_date = partition_date
+    
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        if self.sink is not None:
+            self.sink.close()
+        self.writer = None
+        self.sink = None
+        self.current_date = None
+    
+    def write_rows(self, rows: List[Any]) -> None:
+        start = 0
+        for index in range(1, len(rows) + 1):
+            if index == len(rows) or get_partition_date(rows[index]) != get_partition_date(rows[start]):
+                self.write_batch(rows[start:index])
+                start = index
+    
+    def write_batch(self, rows: List[Any]) -> None:
+        partition_date = get_partition_date(rows[0])
+        if partition_date != self.current_date:
+            self.close()
+            self.open(partition_date)
+    
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array([row[index] for row in rows], type=field.type) for index, field in enumerate(self.schema)],
+            schema=self.schema
+        )
+        self.writer.write_batch(batch)
+        self.rows += len(rows)
+    
+    def commit(self) -> List[str]:
+        self.close()
+        paths = []
+        for partial_path in self.partial_paths:
+            path = partial_path[:-len(".partial")]
+            os.replace(partial_path, path)
+            paths.append(path)
+        return paths
+    
+    def abort(self) -> None:
+        self.close()
+        for partial_path in self.partial_paths:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+def read_watermark(export_dir: str) -> Dict[str, Any]:
+    path = os.path.join(export_dir, WATERMARK_FILE)
+    if not os.path.exists(path):
+        return {"upto": None, "rescored_at": None, "run_id": None}
+    with open(path, encoding="utf-8") as stream:
+        watermark = json.load(stream)
+    return {
+        "upto": (datetime.fromisoformat(watermark["finished_at"]), int(watermark["game_id"])),
+        "rescored_at": datetime.fromisoformat(watermark["rescored_at"]) if watermark.get("rescored_at") else None,
+        "run_id": watermark.get("run_id")
+    }
+
+def write_watermark(
+    export_dir: str,
+    upto: Tuple[datetime, int],
+    rescored_at: Optional[datetime],
+    run_id: str
+) -> None:
+    path = os.path.join(export_dir, WATERMARK_FILE)
+    with open(f"{path}.partial", "w", encoding="utf-8") as stream:
+        json.dump({
+            "finished_at": upto[0].isoformat(),
+            "game_id": upto[1],
+            "rescored_at": rescored_at.isoformat() if rescored_at else None,
+            "run_id": run_id
+        }, stream)
+    os.replace(f"{path}.partial", path)
+
+def remove_uncommitted_files(export_dir: str, committed_run_id: Optional[str]) -> List[str]:
+    # files of a run that crashed before writing its watermark are exported again by the next run,
+    # without any watermark every part file belongs to such a run
+    removed = []
+    for dataset in EXPORT_SCHEMAS:
+        for directory, _, names in os.walk(os.path.join(export_dir, dataset)):
+            for name in names:
+                if not name.startswith("part-"):
+                    continue
+                run_id = name[len("part-"):].split(".", 1)[0]
+                if name.endswith(".partial") or committed_run_id is None or run_id > committed_run_id:
+                    os.remove(os.path.join(directory, name))
+                    removed.append(os.path.join(directory, name))
+    return removed
+
+async def export_gameplay(
+    export_dir: str = ANALYTICS_EXPORT_DIR,
+    export_format: str = "parquet",
+    batch_rows: int = ANALYTICS_EXPORT_BATCH_ROWS,
+    settle_seconds: int = ANALYTICS_EXPORT_SETTLE_SECONDS
+) -> Dict[str, Any]:
+    os.makedirs(export_dir, exist_ok=True)
+    watermark = read_watermark(export_dir)
+    after, rescored_after = watermark["upto"], watermark["rescored_at"]
+    removed = remove_uncommitted_files(export_dir, watermark["run_id"])
+    if removed:
+        logger.warning("Removed %s files of an unfinished export: %s", len(removed), ", ".join(removed))
+    
+    now = datetime.now(timezone.utc)
+    until = now - timedelta(seconds=settle_seconds)
+    session_factory = await get_read_sessionmaker(None)
+    
+    async with session_factory() as db:
+        upto = await analytics_queries.get_finished_games_high_watermark(db, until)
+        rescored_upto = await analytics_queries.get_rescored_games_high_watermark(db, until)
+    
+    report = {
+        "after": after,
+        "upto": upto,
+        "rescored_after": rescored_after,
+        "rescored_upto": rescored_upto,
+        "datasets": {}
+    }
+    has_finished = upto and (not after or upto > after)
+    has_rescored = rescored_upto and (not rescored_after or rescored_upto > rescored_after)
+    if not upto or not (has_finished or has_rescored):
+        return report
+    
+    run_id = f"{now:%Y%m%dT%H%M%S%f}"
+    writers = {
+        dataset: DatePartitionedWriter(export_dir, dataset, export_format, run_id)
+        for dataset in EXPORT_SCHEMAS
+    }
+    try:
+        for dataset, writer in writers.items():
+            async with session_factory() as db:
+                async for rows in analytics_queries.stream_export_rows(
+                    db, dataset, after, upto, rescored_after, rescored_upto, batch_rows
+                ):
+                    writer.write_rows(rows)
+            writer.close()
+    except BaseException:
+        for writer in writers.values():
+            writer.abort()
+        raise
+    
+    for dataset, writer in writers.items():
+        report["datasets"][dataset] = {"rows": writer.rows, "files": writer.commit()}
+    write_watermark(export_dir, upto, rescored_upto or rescored_after, run_id)
+    
+    logger.info("Exported games up to %s: %s", upto, {
+        dataset: result["rows"] for dataset, result in report["datasets"].items()
+    })
+    return report
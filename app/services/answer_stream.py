@@ -0,0 +1,248 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+import redis.asyncio as redis
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.database import SessionLocal
+from app.queries import scoring as scoring_queries
+from app.config.config import Config
+
+config = Config()
+logger = logging.getLogger(__name__)
+
+ANSWER_STREAM_KEY = "answers:stream"
+ANSWER_DEAD_LETTER_KEY = "answers:dead"
+ANSWER_CONSUMER_GROUP = "answer-flushers"
+ANSWER_FLUSH_BATCH_SIZE = int(config.ANSWER_FLUSH_BATCH_SIZE)
+ANSWER_FLUSH_INTERVAL_SECONDS = int(config.ANSWER_FLUSH_INTERVAL_MS) / 1000
+ANSWER_FLUSHER_TASKS = int(config.ANSWER_FLUSHER_TASKS)
+ANSWER_CLAIM_IDLE_MS = 30000
+ANSWER_CLAIM_INTERVAL_SECONDS = 30
+ANSWER_DRAIN_TIMEOUT_SECONDS = 10
+ANSWER_DRAIN_CLAIM_IDLE_MS = 2000
+
+CONSUMER_PREFIX = f"{socket.gethostname()}-{os.getpid()}"
+# errors an answer hits again on every retry; anything else (a dropped connection,
+# a failover, a timeout) leaves the entry pending so XAUTOCLAIM redelivers it
+PERMANENT_ANSWER_ERRORS = (IntegrityError, DataError, KeyError, ValueError)
+
+_flusher_tasks: List[asyncio.Task] = []
+
+ACK_ANSWER_ENTRIES_SCRIPT = """
+local acked = 0
+for i = 3, #KEYS do
+    local offset = (i - 3) * 3 + 2
+    if redis.call('XACK', KEYS[1], ARGV[1], ARGV[offset]) == 1 then
+        acked = acked + 1
+        redis.call('XDEL', KEYS[1], ARGV[offset])
+        if ARGV[offset + 1] == '1' then
+            redis.call('XADD', KEYS[2], '*', 'answer', ARGV[offset + 2])
+        end
+        if redis.call('EXISTS', KEYS[i]) == 1 and redis.call('DECR', KEYS[i]) <= 0 then
+            redis.call('DEL', KEYS[i])
+        end
+    end
+end
+return acked
+"""
+
+def get_pending_answers_key(game_id: int) -> str:
+    return f"game:{game_id}:pending_answers"
+
+def enqueue_answer(pipe: Any, answer: Dict[str, Any]) -> None:
+    pending_key = get_pending_answers_key(answer["game_id"])
+    pipe.xadd(ANSWER_STREAM_KEY, {"answer": json.dumps(answer)})
+    pipe.incr(pending_key)
+    pipe.expire(pending_key, 3600)
+
+async def ensure_answer_consumer_group(redis_client: redis.Redis) -> None:
+    try:
+        await redis_client.xgroup_create(
+            ANSWER_STREAM_KEY, ANSWER_CONSUMER_GROUP, id="0", mkstream=True
+        )
+    except redis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+def aggregate_inserted_answers(inserted: List[Any]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    sessions: Dict[int, Dict[str, Any]] = {}
+    questions: Dict[int, Dict[str, Any]] = {}
+    for game_session_id, game_created_at, question_id, is_correct, response_time, points_earned in inserted:
+        session = sessions.setdefault(game_session_id, {
+            "game_session_id": game_session_id,
+            "game_created_at": game_created_at,
+            "points": 0.0,
+            "correct": 0,
+            "answers": 0,
+            "response_time": 0.0
+        })
+        session["points"] += points_earned
+        session["correct"] += int(is_correct)
+        session["answers"] += 1
+        session["response_time"] += response_time
+        
+        question = questions.setdefault(question_id, {
+            "question_id": question_id,
+            "attempts": 0,
+            "correct_count": 0,
+            "response_time_sum": 0.0,
+            "response_time_sq_sum": 0.0
+        })
+        question["attempts"] += 1
+        question["correct_count"] += int(is_correct)
+        question["response_time_sum"] += response_time
+        question["response_time_sq_sum"] += response_time * response_time
+    
+    return list(sessions.values()), list(questions.values())
+
+async def persist_answers(answers: List[Dict[str, Any]]) -> None:
+    rows = [
+        {
+            "game_session_id": answer["game_session_id"],
+            "question_id": answer["question_id"],
+            "user_answer": answer["user_answer"],
+            "is_correct": answer["is_correct"],
+            "response_time": answer["response_time"],
+            "points_earned": answer["points_earned"],
+            "answered_at": datetime.fromisoformat(answer["answered_at"]),
+            "game_created_at": datetime.fromisoformat(answer["game_created_at"])
+        } for answer in answers
+    ]
+    
+    async with SessionLocal() as db:
+        inserted = await scoring_queries.insert_answers(db, rows)
+        session_deltas, question_attempts = aggregate_inserted_answers(inserted)
+        await scoring_queries.apply_game_session_deltas(db, session_deltas)
+        await scoring_queries.record_question_attempts(db, question_attempts)
+        await db.commit()
+
+async def flush_answer_entries(
+    redis_client: redis.Redis,
+    entries: List[Tuple[str, Dict[str, str]]]
+) -> int:
+    entries = [(entry_id, fields) for entry_id, fields in entries if fields]
+    if not entries:
+        return 0
+    
+    answers = [json.loads(fields["answer"]) for _, fields in entries]
+    saved = set()
+    dead_letters = set()
+    try:
+        await persist_answers(answers)
+        saved = {entry_id for entry_id, _ in entries}
+    except PERMANENT_ANSWER_ERRORS:
+        logger.exception("Batch answer flush failed, retrying entries one by one")
+        for (entry_id, fields), answer in zip(entries, answers):
+            try:
+                await persist_answers([answer])
+            except PERMANENT_ANSWER_ERRORS:
+                logger.exception("Moving answer %s to %s", entry_id, ANSWER_DEAD_LETTER_KEY)
+                dead_letters.add(entry_id)
+            except Exception:
+                logger.exception("Answer flush failed, leaving %s for redelivery", entry_id)
+                break
+            saved.add(entry_id)
+    except Exception:
+        logger.exception("Answer flush failed, leaving %s entries for redelivery", len(entries))
+        return 0
+    
+    keys = [ANSWER_STREAM_KEY, ANSWER_DEAD_LETTER_KEY]
+    arguments = [ANSWER_CONSUMER_GROUP]
+    for (entry_id, fields), answer in zip(entries, answers):
+        if entry_id not in saved:
+            continue
+        keys.append(get_pending_answers_key(answer["game_id"]))
+        dead = entry_id in dead_letters
+        arguments += [entry_id, int(dead), fields["answer"] if dead else ""]
+    return await redis_client.eval(ACK_ANSWER_ENTRIES_SCRIPT, len(keys), *keys, *arguments)
+
+async def flush_answer_batch(redis_client: redis.Redis, consumer: str) -> int:
+    response = await redis_client.xreadgroup(
+        ANSWER_CONSUMER_GROUP,
+        consumer,
+        {ANSWER_STREAM_KEY: ">"},
+        count=ANSWER_FLUSH_BATCH_SIZE
+    )
+    if not response:
+        return 0
+    return await flush_answer_entries(redis_client, response[0][1])
+
+async def claim_stale_answers(
+    redis_client: redis.Redis,
+    consumer: str,
+    min_idle_ms: int = ANSWER_CLAIM_IDLE_MS,
+    start_id: str = "0-0"
+) -> Tuple[str, int]:
+    response = await redis_client.xautoclaim(
+        ANSWER_STREAM_KEY,
+        ANSWER_CONSUMER_GROUP,
+        consumer,
+        min_idle_ms,
+        start_id=start_id,
+        count=ANSWER_FLUSH_BATCH_SIZE
+    )
+    return response[0], await flush_answer_entries(redis_client, response[1])
+
+async def run_answer_flusher(redis_client: redis.Redis, consumer: str) -> None:
+    last_claim = 0.0
+    while True:
+        try:
+            if time.monotonic() - last_claim >= ANSWER_CLAIM_INTERVAL_SECONDS:
+                last_claim = time.monotonic()
+                await claim_stale_answers(redis_client, consumer)
+            
+            if await flush_answer_batch(redis_client, consumer) >= ANSWER_FLUSH_BATCH_SIZE:
+                continue
+        except asyncio.CancelledError:
+            raise
+        except redis.ResponseError as e:
+            if "NOGROUP" in str(e):
+                await ensure_answer_consumer_group(redis_client)
+            else:
+                logger.exception("Answer flusher %s failed", consumer)
+        except Exception:
+            logger.exception("Answer flusher %s failed", consumer)
+        
+        await asyncio.sleep(ANSWER_FLUSH_INTERVAL_SECONDS)
+
+async def wait_for_answers_drained(redis_client: redis.Redis, game_id: int) -> None:
+    pending_key = get_pending_answers_key(game_id)
+    consumer = f"{CONSUMER_PREFIX}-drain"
+    deadline = time.monotonic() + ANSWER_DRAIN_TIMEOUT_SECONDS
+    claim_cursor = "0-0"
+    
+    while True:
+        pending = await redis_client.get(pending_key)
+        if not pending or int(pending) <= 0:
+            return
+        
+        if time.monotonic() >= deadline:
+            raise RuntimeError(f"Timed out waiting for answers of game {game_id} to be saved")
+        
+        if await flush_answer_batch(redis_client, consumer):
+            continue
+        
+        claim_cursor, claimed = await claim_stale_answers(
+            redis_client, consumer, ANSWER_DRAIN_CLAIM_IDLE_MS, claim_cursor
+        )
+        if not claimed:
+            await asyncio.sleep(ANSWER_FLUSH_INTERVAL_SECONDS / 2)
+
+async def start_answer_flushers(redis_client: redis.Redis) -> None:
+    await ensure_answer_consumer_group(redis_client)
+    for index in range(ANSWER_FLUSHER_TASKS):
+        _flusher_tasks.append(asyncio.create_task(
+            run_answer_flusher(redis_client, f"{CONSUMER_PREFIX}-{index}")
+        ))
+
+async def stop_answer_flushers() -> None:
+    for task in _flusher_tasks:
+        task.cancel()
+    await asyncio.gather(*_flusher_tasks, return_exceptions=True)
+    _flusher_tasks.clear()
@@ -2,14 +2,39 @@ from datetime import datetime, timedelta
 from typing import Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+import redis.asyncio as redis
 
 from app.queries import auth as auth_queries
-from app.schemas.user import UserCreate, UserResponse
-from app.utils.auth import get_password_hash, verify_password, create_access_token
+from app.schemas.user import UserCreate, UserResponse, UserPrincipal, UserFlagsUpdate
+from app.utils.auth import (
+    get_password_hash_async, verify_password_async, create_access_token, build_token_claims
+)
+from app.utils.cache import TTLCache
 from app.config.config import Config
 
 config = Config()
 
+USER_PRINCIPAL_TTL_SECONDS = 300
+USER_PRINCIPAL_LOCAL_TTL_SECONDS = 15
+USER_PRINCIPAL_LOCAL_MAX_ENTRIES = 10000
+USER_PRINCIPAL_VERSION_TTL_SECONDS = 3600
+
+FILL_USER_PRINCIPAL_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+user_principal_cache = TTLCache(USER_PRINCIPAL_LOCAL_MAX_ENTRIES, USER_PRINCIPAL_LOCAL_TTL_SECONDS)
+
+def get_user_principal_key(user_id: int) -> str:
+    return f"user:principal:{user_id}"
+
+def get_user_principal_version_key(user_id: int) -> str:
+    return f"user:principal:{user_id}:version"
+
 async def register_user(
     db: AsyncSession,
     user_data: UserCreate
@@ -29,7 +54,7 @@ async def register_user(
             detail="Email already registered"
         )
     
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     user = await auth_queries.create_user(
         db=db,
         username=user_data.username,
@@ -48,7 +73,7 @@ async def authenticate_user(
 ) -> Tuple[str, UserResponse]:
     
     user = await auth_queries.get_user_by_username(db, username)
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await verify_password_async(password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
@@ -62,7 +87,7 @@ async def authenticate_user(
     
     access_token_expires = timedelta(minutes=int(config.ACCESS_TOKEN_EXPIRE_MINUTES))
     access_token = create_access_token(
-        data={"sub": user.username},
+        data=build_token_claims(user),
         expires_delta=access_token_expires
     )
     
@@ -80,4 +105,77 @@ async def get_current_user(
             detail="User not found"
         )
     
-    return user
\ No newline at end of file
+    return user
+
+async def get_user_principal(
+    db: AsyncSession,
+    redis_client: redis.Redis,
+    user_id: int
+) -> UserPrincipal:
+    principal = user_principal_cache.get(user_id)
+    if principal:
+        return principal
+    
+    key = get_user_principal_key(user_id)
+    cached = await redis_client.get(key)
+    if cached:
+        principal = UserPrincipal.model_validate_json(cached)
+        user_principal_cache.set(user_id, principal)
+        return principal
+    
+    # an invalidation between the read and the fill bumps the version, so the stale fill is dropped
+    version_key = get_user_principal_version_key(user_id)
+    version = await redis_client.get(version_key)
+    user = await auth_queries.get_user_by_id(db, user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    principal = UserPrincipal.model_validate(user)
+    filled = await redis_client.eval(
+        FILL_USER_PRINCIPAL_SCRIPT, 2, key, version_key,
+        version or "", principal.model_dump_json(), USER_PRINCIPAL_TTL_SECONDS
+    )
+    if filled:
+        user_principal_cache.set(user_id, principal)
+    return principal
+
+async def invalidate_user_principal(redis_client: redis.Redis, user_id: int) -> None:
+    user_principal_cache.pop(user_id)
+    version_key = get_user_principal_version_key(user_id)
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.incr(version_key)
+    pipe.expire(version_key, USER_PRINCIPAL_VERSION_TTL_SECONDS)
+    pipe.delete(get_user_principal_key(user_id))
+    await pipe.execute()
+
+async def get_user_profile(db: AsyncSession, user_id: int) -> UserResponse:
+    user = await auth_queries.get_user_by_id(db, user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    
+    return user
+
+async def update_user_flags(
+    db: AsyncSession,
+    redis_client: redis.Redis,
+    user_id: int,
+    flags: UserFlagsUpdate
+) -> UserPrincipal:
+    user = await auth_queries.get_user_by_id(db, user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    user = await auth_queries.update_user_flags(
+        db, user, is_active=flags.is_active, is_admin=flags.is_admin
+    )
+    await invalidate_user_principal(redis_client, user_id)
+    
+    return UserPrincipal.model_validate(user)
\ No newline at end of file
@@ -1,17 +1,56 @@
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis
 from datetime import datetime, timedelta
 from sqlalchemy import select
 
 from app.queries import game as game_queries
+from app.queries import scoring as scoring_queries
+from app.queries import users as user_queries
+from app.services.leaderboard import record_period_scores
+from app.services.answer_stream import wait_for_answers_drained
+from app.services.seen_questions import filter_unseen_questions, mark_questions_seen
+from app.services.question_pool import (
+    DIFFICULTY_MIX, QUESTIONS_PER_GAME, ensure_question_pools, sample_question_ids
+)
 from app.models.game import GameStatus
 from app.config.config import Config
 from app.models.user import User
 
 config = Config()
 
+QUESTION_CANDIDATE_MULTIPLIER = 8
+
+async def select_game_questions(
+    db: AsyncSession,
+    redis_client: redis.Redis,
+    subject: str,
+    player_ids: List[int]
+) -> List[Any]:
+    await ensure_question_pools(db, redis_client)
+    candidates = sample_question_ids(
+        subject, max(DIFFICULTY_MIX.values()) * QUESTION_CANDIDATE_MULTIPLIER
+    )
+    candidate_ids = [question_id for ids in candidates.values() for question_id in ids]
+    unseen_ids = set(await filter_unseen_questions(
+        redis_client, player_ids, subject, candidate_ids
+    ))
+    
+    selected_ids = []
+    for difficulty, count in DIFFICULTY_MIX.items():
+        stratum = sorted(candidates.get(difficulty, []), key=lambda q: q not in unseen_ids)
+        selected_ids += stratum[:count]
+    
+    if len(selected_ids) < QUESTIONS_PER_GAME:
+        remaining = sorted(
+            (q for q in candidate_ids if q not in selected_ids),
+            key=lambda q: q not in unseen_ids
+        )
+        selected_ids += remaining[:QUESTIONS_PER_GAME - len(selected_ids)]
+    
+    return await game_queries.get_questions_by_ids(db, selected_ids)
+
 async def start_game(
     db: AsyncSession,
     redis_client: redis.Redis,
@@ -26,10 +65,9 @@ async def start_game(
     if game.status != GameStatus.WAITING:
         raise ValueError("Game cannot be started")
     
-    questions = await game_queries.get_random_unused_questions_by_subject(
-        db, game.subject, 5
-    )
-    if len(questions) < 5:
+    player_ids = [member.user_id for team in game.teams for member in team.members]
+    questions = await select_game_questions(db, redis_client, game.subject, player_ids)
+    if len(questions) < QUESTIONS_PER_GAME:
         raise ValueError(f"Not enough questions for subject {game.subject}")
     
     start_time = datetime.utcnow()
@@ -40,16 +78,20 @@ async def start_game(
     )
     
     all_players = []
+    game_sessions = []
     for team in game.teams:
         for member in team.members:
             all_players.append(member.user_id)
-            await game_queries.create_game_session(db, game.id, member.user_id)
+            game_sessions.append(
+                await game_queries.create_game_session(db, game.id, member.user_id, game.created_at)
+            )
     
     await db.commit()
     
     game_data = {
         "game_id": game.id,
         "status": "in_progress",
+        "created_at": game.created_at.isoformat(),
         "start_time": start_time.isoformat(),
         "end_time": end_time.isoformat(),
         "current_question": 0,
@@ -63,6 +105,9 @@ async def start_game(
             } for q in questions
         ],
         "players": all_players,
+        "sessions": {
+            str(game_session.user_id): game_session.id for game_session in game_sessions
+        },
         "teams": [
             {
                 "team_id": team.id,
@@ -72,6 +117,9 @@ async def start_game(
     }
     
     await redis_client.set(f"game:{game_id}", json.dumps(game_data), ex=3600)
+    await mark_questions_seen(
+        redis_client, all_players, game.subject, [q.id for q in questions]
+    )
     
     return {
         "game_id": game.id,
@@ -192,22 +240,74 @@ async def check_and_advance_question(
     
     return None
 
+def build_user_game_summaries(
+    game: Any,
+    team_scores: Dict[int, float],
+    winner_team_id: Optional[int],
+    usernames: Dict[int, str],
+    finished_at: datetime
+) -> List[Dict[str, Any]]:
+    sessions = {session.user_id: session for session in game.game_sessions}
+    rows = []
+    for team in game.teams:
+        opponent_scores = [score for team_id, score in team_scores.items() if team_id != team.id]
+        for member in team.members:
+            session = sessions.get(member.user_id)
+            if not session:
+                continue
+            rows.append({
+                "user_id": member.user_id,
+                "game_id": game.id,
+                "subject": game.subject,
+                "total_score": session.total_score or 0.0,
+                "correct_answers": session.correct_answers or 0,
+                "total_answers": session.total_answers or 0,
+                "response_time_sum": (session.average_response_time or 0.0) * (session.total_answers or 0),
+                "team_id": team.id,
+                "team_score": team_scores.get(team.id, 0.0),
+                "opponent_score": max(opponent_scores, default=0.0),
+                "is_winner": team.id == winner_team_id,
+                "teammates": [
+                    {"user_id": mate.user_id, "username": usernames.get(mate.user_id)}
+                    for mate in team.members if mate.user_id != member.user_id
+                ],
+                "finished_at": finished_at
+            })
+    return rows
+
+def build_user_subject_stat_delta(summary: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "user_id": summary["user_id"],
+        "subject": summary["subject"],
+        "games_played": 1,
+        "games_won": int(summary["is_winner"]),
+        "total_score": summary["total_score"],
+        "correct_answers": summary["correct_answers"],
+        "total_answers": summary["total_answers"],
+        "response_time_sum": summary["response_time_sum"]
+    }
+
 async def end_game(
     db: AsyncSession,
     redis_client: redis.Redis,
     game_id: int
 ) -> Dict[str, Any]:
     
+    await wait_for_answers_drained(redis_client, game_id)
+    
     game = await game_queries.get_game_with_teams_and_sessions(db, game_id)
     
     if not game:
         raise ValueError("Game not found")
     
+    finished_at = datetime.utcnow()
     await game_queries.update_game_status(
-        db, game, GameStatus.FINISHED, end_time=datetime.utcnow()
+        db, game, GameStatus.FINISHED, end_time=finished_at
     )
     
     team_scores = {}
+    user_scores = {}
+    usernames = {}
     for team in game.teams:
         team_total = 0
         for member in team.members:
@@ -217,18 +317,19 @@ async def end_game(
             )
             if session:
                 team_total += session.total_score
+                user_scores[member.user_id] = session.total_score
                 user_result = await db.execute(select(User).where(User.id == member.user_id))
                 user = user_result.scalar_one_or_none()
                 if user:
+                    usernames[user.id] = user.username
                     user.total_games += 1
                     user.total_score += session.total_score
         
         team.total_score = team_total
         team_scores[team.id] = team_total
     
-    winner_team_id = None
-    if team_scores:
-        winner_team_id = max(team_scores.items(), key=lambda x: x[1])[0]
+    winner_team_id = scoring_queries.get_winner_team_id(team_scores)
+    if winner_team_id is not None:
         for team in game.teams:
             is_winner = (team.id == winner_team_id)
             team.is_winner = is_winner
@@ -239,9 +340,20 @@ async def end_game(
                     if user:
                         user.total_wins += 1
     
+    summaries = build_user_game_summaries(game, team_scores, winner_team_id, usernames, finished_at)
+    await user_queries.lock_user_subject_stats(db)
+    inserted_user_ids = set(await game_queries.insert_user_game_summaries(db, summaries))
+    await user_queries.increment_user_subject_stats(db, [
+        build_user_subject_stat_delta(summary)
+        for summary in summaries if summary["user_id"] in inserted_user_ids
+    ])
     await db.commit()
     
     await redis_client.delete(f"game:{game_id}")
+    await record_period_scores(redis_client, {
+        user_id: score for user_id, score in user_scores.items()
+        if user_id in inserted_user_ids
+    }, finished_at)
     
     return {
         "game_id": game.id,
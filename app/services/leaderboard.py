@@ -1,25 +1,81 @@
-from typing import List, Dict, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis
 import json
+from datetime import datetime, timedelta
 
 from app.queries import leaderboard as leaderboard_queries
+from app.config.config import Config
+from app.utils.pagination import encode_cursor, decode_cursor
+
+config = Config()
+
+LEADERBOARD_PERIODS = ("daily", "weekly", "season")
+ROLLING_CACHE_SECONDS = 60
+LEADERBOARD_COUNT_CACHE_SECONDS = 120
+
+def get_leaderboard_position(
+    page: int,
+    page_size: int,
+    cursor: Optional[str]
+) -> Tuple[int, Optional[Tuple[float, int]]]:
+    if not cursor:
+        return (page - 1) * page_size, None
+    
+    total_score, user_id, offset = decode_cursor(cursor, 3)
+    try:
+        return int(offset), (float(total_score), int(user_id))
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+def get_next_leaderboard_cursor(
+    users: List[Any],
+    offset: int,
+    page_size: int
+) -> Optional[str]:
+    if len(users) < page_size:
+        return None
+    
+    last_user = users[-1]
+    return encode_cursor([last_user.total_score, last_user.id, offset + len(users)])
+
+async def get_leaderboard_count(
+    redis_client: redis.Redis,
+    count_key: str,
+    count: Callable[[], Awaitable[int]]
+) -> int:
+    cached_count = await redis_client.get(count_key)
+    if cached_count is not None:
+        return int(cached_count)
+    
+    total_entries = await count()
+    await redis_client.setex(count_key, LEADERBOARD_COUNT_CACHE_SECONDS, total_entries)
+    return total_entries
 
 async def get_global_leaderboard(
     db: AsyncSession,
     redis_client: redis.Redis,
     page: int = 1,
-    page_size: int = 50
+    page_size: int = 50,
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
-    cache_key = f"leaderboard:global:page:{page}:size:{page_size}"
+    if cursor:
+        cache_key = f"leaderboard:global:cursor:{cursor}:size:{page_size}"
+    else:
+        cache_key = f"leaderboard:global:page:{page}:size:{page_size}"
     
     cached_data = await redis_client.get(cache_key)
     if cached_data:
         return json.loads(cached_data)
     
-    offset = (page - 1) * page_size
-    users, total_entries = await leaderboard_queries.get_global_leaderboard_entries(
-        db, offset, page_size
+    offset, after = get_leaderboard_position(page, page_size, cursor)
+    users = await leaderboard_queries.get_global_leaderboard_entries(
+        db, offset, page_size, after
+    )
+    total_entries = await get_leaderboard_count(
+        redis_client,
+        "leaderboard:global:count",
+        lambda: leaderboard_queries.count_global_leaderboard_entries(db)
     )
     
     leaderboard_data = {
@@ -35,7 +91,8 @@ async def get_global_leaderboard(
         ],
         "total_entries": total_entries,
         "page": page,
-        "page_size": page_size
+        "page_size": page_size,
+        "next_cursor": get_next_leaderboard_cursor(users, offset, page_size)
     }
     
     await redis_client.setex(cache_key, 120, json.dumps(leaderboard_data))
@@ -46,17 +103,26 @@ async def get_location_leaderboard(
     redis_client: redis.Redis,
     country: str,
     page: int = 1,
-    page_size: int = 50
+    page_size: int = 50,
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
-    cache_key = f"leaderboard:country:{country}:page:{page}:size:{page_size}"
+    if cursor:
+        cache_key = f"leaderboard:country:{country}:cursor:{cursor}:size:{page_size}"
+    else:
+        cache_key = f"leaderboard:country:{country}:page:{page}:size:{page_size}"
     
     cached_data = await redis_client.get(cache_key)
     if cached_data:
         return json.loads(cached_data)
     
-    offset = (page - 1) * page_size
-    users, total_entries = await leaderboard_queries.get_location_leaderboard_entries(
-        db, country, offset, page_size
+    offset, after = get_leaderboard_position(page, page_size, cursor)
+    users = await leaderboard_queries.get_location_leaderboard_entries(
+        db, country, offset, page_size, after
+    )
+    total_entries = await get_leaderboard_count(
+        redis_client,
+        f"leaderboard:country:{country}:count",
+        lambda: leaderboard_queries.count_location_leaderboard_entries(db, country)
     )
     
     leaderboard_data = {
@@ -73,8 +139,113 @@ async def get_location_leaderboard(
         "country": country,
         "total_entries": total_entries,
         "page": page,
-        "page_size": page_size
+        "page_size": page_size,
+        "next_cursor": get_next_leaderboard_cursor(users, offset, page_size)
     }
     
     await redis_client.setex(cache_key, 120, json.dumps(leaderboard_data))
-    return leaderboard_data 
\ No newline at end of file
+    return leaderboard_data
+
+def get_season_bounds(moment: datetime) -> Tuple[int, datetime, datetime]:
+    season_start = datetime.strptime(config.LEADERBOARD_SEASON_START, "%Y-%m-%d")
+    season_length = timedelta(days=int(config.LEADERBOARD_SEASON_DAYS))
+    season = max(0, (moment - season_start) // season_length)
+    start = season_start + season * season_length
+    return season, start, start + season_length
+
+def get_bucket_keys(moment: datetime) -> List[Tuple[str, datetime]]:
+    retention = timedelta(days=int(config.LEADERBOARD_BUCKET_RETENTION_DAYS))
+    hour = moment.replace(minute=0, second=0, microsecond=0)
+    day = hour.replace(hour=0)
+    season, _, season_end = get_season_bounds(moment)
+    
+    return [
+        (f"leaderboard:bucket:hour:{hour:%Y%m%d%H}", hour + timedelta(hours=25)),
+        (f"leaderboard:bucket:day:{day:%Y%m%d}", day + timedelta(days=8) + retention),
+        (f"leaderboard:bucket:season:{season}", season_end + retention)
+    ]
+
+async def record_period_scores(
+    redis_client: redis.Redis,
+    user_scores: Dict[int, float],
+    finished_at: datetime
+) -> None:
+    if not user_scores:
+        return
+    
+    pipe = redis_client.pipeline(transaction=False)
+    for bucket_key, expires_at in get_bucket_keys(finished_at):
+        for user_id, score in user_scores.items():
+            pipe.zincrby(bucket_key, score, user_id)
+        pipe.expireat(bucket_key, expires_at)
+    await pipe.execute()
+
+async def get_period_leaderboard_key(
+    redis_client: redis.Redis,
+    period: str,
+    moment: datetime
+) -> str:
+    if period == "season":
+        season, _, _ = get_season_bounds(moment)
+        return f"leaderboard:bucket:season:{season}"
+    
+    if period == "daily":
+        hour = moment.replace(minute=0, second=0, microsecond=0)
+        window_key = f"leaderboard:rolling:daily:{hour:%Y%m%d%H}"
+        bucket_keys = [
+            f"leaderboard:bucket:hour:{hour - timedelta(hours=i):%Y%m%d%H}"
+            for i in range(24)
+        ]
+    else:
+        day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+        window_key = f"leaderboard:rolling:weekly:{day:%Y%m%d}"
+        bucket_keys = [
+            f"leaderboard:bucket:day:{day - timedelta(days=i):%Y%m%d}"
+            for i in range(7)
+        ]
+    
+    if not await redis_client.exists(window_key):
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.zunionstore(window_key, bucket_keys)
+        pipe.expire(window_key, ROLLING_CACHE_SECONDS)
+        await pipe.execute()
+    
+    return window_key
+
+async def get_period_leaderboard(
+    db: AsyncSession,
+    redis_client: redis.Redis,
+    period: str,
+    page: int = 1,
+    page_size: int = 50
+) -> Dict[str, Any]:
+    if period not in LEADERBOARD_PERIODS:
+        raise ValueError(f"Unknown leaderboard period: {period}")
+    
+    key = await get_period_leaderboard_key(redis_client, period, datetime.utcnow())
+    
+    offset = (page - 1) * page_size
+    entries = await redis_client.zrevrange(
+        key, offset, offset + page_size - 1, withscores=True
+    )
+    total_entries = await redis_client.zcard(key)
+    
+    user_ids = [int(member) for member, _ in entries]
+    users = await leaderboard_queries.get_users_by_ids(db, user_ids)
+    users_by_id = {user.id: user for user in users}
+    
+    return {
+        "leaderboard": [
+            {
+                "rank": offset + i + 1,
+                "username": users_by_id[user_id].username,
+                "score": score,
+                "country": users_by_id[user_id].country
+            } for i, (user_id, (_, score)) in enumerate(zip(user_ids, entries))
+            if user_id in users_by_id
+        ],
+        "period": period,
+        "total_entries": total_entries,
+        "page": page,
+        "page_size": page_size
+    }
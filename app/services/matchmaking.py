@@ -5,6 +5,8 @@ import redis.asyncio as redis
 from datetime import datetime
 
 from app.queries import matchmaking as matchmaking_queries
+from app.services.subject_catalog import get_subject_catalog, ensure_subject_playable
+from app.services.question_pool import QUESTIONS_PER_GAME
 from app.config.config import Config
 
 config = Config()
@@ -16,6 +18,8 @@ async def join_matchmaking_queue(
     subject: str
 ) -> Dict[str, Any]:
     
+    await ensure_subject_playable(db, redis_client, subject)
+    
     existing = await redis_client.get(f"user_queue:{user_id}")
     if existing:
         return {"status": "already_in_queue", "subject": json.loads(existing)["subject"]}
@@ -156,4 +160,16 @@ async def leave_matchmaking_queue(
             await redis_client.lpush(queue_key, item)
     
     await redis_client.delete(f"user_queue:{user_id}")
-    return True
\ No newline at end of file
+    return True
+
+async def get_matchmaking_subjects(
+    db: AsyncSession,
+    redis_client: redis.Redis
+) -> Dict[str, Any]:
+    catalog = await get_subject_catalog(db, redis_client)
+    return {
+        "subjects": [
+            subject for subject, count in catalog.items() if count >= QUESTIONS_PER_GAME
+        ],
+        "question_counts": catalog
+    }
\ No newline at end of file
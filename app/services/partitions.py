@@ -0,0 +1,101 @@
+import gzip
+import logging
+import os
+from datetime import date
+from typing import Any, Dict, List
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal
+from app.queries import partitions as partition_queries
+from app.queries.partitions import PARTITIONED_TABLES, add_months
+from app.config.config import Config
+
+config = Config()
+logger = logging.getLogger(__name__)
+
+PARTITION_MONTHS_AHEAD = int(config.PARTITION_MONTHS_AHEAD)
+PARTITION_RETENTION_MONTHS = int(config.PARTITION_RETENTION_MONTHS)
+PARTITION_ARCHIVE_DIR = config.PARTITION_ARCHIVE_DIR
+ARCHIVE_BATCH_SIZE = 5000
+
+def get_current_month() -> date:
+    return date.today().replace(day=1)
+
+async def ensure_partitions(
+    db: AsyncSession,
+    months_ahead: int = PARTITION_MONTHS_AHEAD
+) -> List[str]:
+    await partition_queries.lock_partition_maintenance(db)
+    
+    created = []
+    current = get_current_month()
+    for table in PARTITIONED_TABLES:
+        existing = set(await partition_queries.get_partition_names(db, table))
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_queries.get_partition_name(table, month)
+            if name not in existing:
+                await partition_queries.create_partition(db, table, month)
+                created.append(name)
+    
+    await db.commit()
+    return created
+
+async def ensure_upcoming_partitions() -> None:
+    try:
+        async with SessionLocal() as db:
+            created = await ensure_partitions(db)
+        if created:
+            logger.info("Created partitions %s", ", ".join(created))
+    except Exception:
+        logger.exception("Failed to create upcoming partitions")
+
+def get_cold_partitions(table: str, names: List[str], retention_months: int) -> List[str]:
+    cutoff = add_months(get_current_month(), -retention_months)
+    return [
+        name for name in names
+        if partition_queries.get_partition_month(table, name) < cutoff
+    ]
+
+async def export_partition(db: AsyncSession, table: str, name: str, archive_dir: str) -> Dict[str, Any]:
+    directory = os.path.join(archive_dir, table)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.ndjson.gz")
+    partial_path = f"{path}.partial"
+    
+    rows = 0
+    with gzip.open(partial_path, "wt", encoding="utf-8") as archive:
+        async for line in partition_queries.stream_partition_rows(db, name, ARCHIVE_BATCH_SIZE):
+            archive.write(line)
+            archive.write("\n")
+            rows += 1
+    os.replace(partial_path, path)
+    
+    return {"table": table, "partition": name, "rows": rows, "path": path}
+
+async def archive_partitions(
+    db: AsyncSession,
+    retention_months: int = PARTITION_RETENTION_MONTHS,
+    archive_dir: str = PARTITION_ARCHIVE_DIR,
+    drop: bool = False,
+    dry_run: bool = False
+) -> List[Dict[str, Any]]:
+    archived = []
+    for table in PARTITIONED_TABLES:
+        names = await partition_queries.get_partition_names(db, table)
+        for name in get_cold_partitions(table, names, retention_months):
+            if dry_run:
+                archived.append({"table": table, "partition": name, "rows": None, "path": None})
+                continue
+    
+            exported = await export_partition(db, table, name, archive_dir)
+            await db.commit()
+    
+            await partition_queries.lock_partition_maintenance(db)
+            await partition_queries.detach_partition(db, table, name, drop)
+            await db.commit()
+    
+            logger.info("Archived %s (%s rows) to %s", name, exported["rows"], exported["path"])
+            archived.append(exported)
+    
+    return archived
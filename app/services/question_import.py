@@ -0,0 +1,163 @@
+import csv
+import json
+from typing import Any, Dict, Iterator, List, TextIO, Tuple, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+import redis.asyncio as redis
+from pydantic import ValidationError
+
+from app.queries import questions as question_queries
+from app.schemas.question import QuestionCreate
+from app.services.questions import (
+    invalidate_question_caches, add_question_count_delta, adjust_question_counts
+)
+
+IMPORT_FORMATS = ("ndjson", "csv")
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+def detect_import_format(filename: str) -> str:
+    return "csv" if filename.lower().endswith(".csv") else "ndjson"
+
+def parse_csv_record(record: Dict[str, str]) -> Dict[str, Any]:
+    parsed = {key: value for key, value in record.items() if key and value not in (None, "")}
+    
+    options = parsed.get("options")
+    if options is not None:
+        if options.lstrip().startswith("["):
+            parsed["options"] = json.loads(options)
+        else:
+            parsed["options"] = [option.strip() for option in options.split("|")]
+    
+    return parsed
+
+def iter_question_records(
+    stream: TextIO,
+    import_format: str
+) -> Iterator[Tuple[int, Union[Dict[str, Any], str]]]:
+    if import_format == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            try:
+                yield reader.line_num, parse_csv_record(record)
+            except json.JSONDecodeError as e:
+                yield reader.line_num, f"Invalid options JSON: {e.msg}"
+        return
+    
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, "Expected a JSON object"
+            continue
+        yield line_number, record
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors(include_url=False)
+    )
+
+async def import_questions(
+    db: AsyncSession,
+    redis_client: redis.Redis,
+    stream: TextIO,
+    import_format: str,
+    dry_run: bool = False,
+    skip_duplicates: bool = False
+) -> Dict[str, Any]:
+    if import_format not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format: {import_format}")
+    
+    imported = 0
+    valid = 0
+    failed = 0
+    duplicate_count = 0
+    errors: List[Dict[str, Any]] = []
+    duplicates: List[Dict[str, Any]] = []
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+    count_deltas: Dict[str, int] = {}
+    
+    def record_error(row: int, message: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"row": row, "error": message})
+    
+    async def flush_batch() -> int:
+        nonlocal duplicate_count
+        matches = await question_queries.find_similar_questions(
+            db, [question["question_text"] for _, question in batch]
+        )
+        
+        seen_texts: Dict[str, int] = {}
+        rows = []
+        for position, (row, question) in enumerate(batch):
+            normalized = " ".join(question["question_text"].lower().split())
+            matched_ids = matches.get(position, [])
+            first_row = seen_texts.setdefault(normalized, row)
+            
+            if matched_ids or first_row != row:
+                duplicate_count += 1
+                if len(duplicates) < MAX_REPORTED_ERRORS:
+                    duplicates.append({
+                        "row": row,
+                        "question_ids": matched_ids,
+                        "duplicate_of_row": first_row if first_row != row else None
+                    })
+                if skip_duplicates:
+                    continue
+            
+            rows.append(question)
+            add_question_count_delta(count_deltas, question["subject"], question["difficulty"], 1)
+        
+        return await question_queries.bulk_insert_questions(db, rows)
+    
+    try:
+        for row, record in iter_question_records(stream, import_format):
+            if isinstance(record, str):
+                record_error(row, record)
+                continue
+            
+            try:
+                question = QuestionCreate.model_validate(record)
+            except ValidationError as e:
+                record_error(row, format_validation_error(e))
+                continue
+            
+            valid += 1
+            batch.append((row, question.model_dump()))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                imported += await flush_batch()
+                batch = []
+        
+        if batch:
+            imported += await flush_batch()
+        
+        if dry_run:
+            await db.rollback()
+        else:
+            await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    
+    if imported and not dry_run:
+        await invalidate_question_caches(redis_client)
+        await adjust_question_counts(redis_client, count_deltas)
+    
+    return {
+        "imported": 0 if dry_run else imported,
+        "valid": valid,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+        "duplicates": duplicates,
+        "duplicate_count": duplicate_count,
+        "duplicates_skipped": skip_duplicates,
+        "dry_run": dry_run
+    }
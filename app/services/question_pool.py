@@ -0,0 +1,91 @@
+import asyncio
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+import redis.asyncio as redis
+
+from app.queries import questions as question_queries
+from app.config.config import Config
+
+config = Config()
+
+QUESTIONS_VERSION_KEY = "questions:version"
+QUESTION_POOL_REFRESH_SECONDS = 300
+
+def parse_difficulty_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        difficulty, count = part.split(":")
+        mix[difficulty.strip()] = int(count)
+    return mix
+
+DIFFICULTY_MIX = parse_difficulty_mix(config.QUESTION_DIFFICULTY_MIX)
+QUESTIONS_PER_GAME = sum(DIFFICULTY_MIX.values())
+
+_pools: Dict[str, Dict[str, List[int]]] = {}
+_positions: Dict[int, Tuple[str, str, int]] = {}
+_loaded_version: Optional[int] = None
+_loaded_at = 0.0
+_load_lock = asyncio.Lock()
+
+def _add(question_id: int, subject: str, difficulty: str) -> None:
+    pool = _pools.setdefault(subject, {}).setdefault(difficulty, [])
+    _positions[question_id] = (subject, difficulty, len(pool))
+    pool.append(question_id)
+
+def _remove(question_id: int) -> None:
+    position = _positions.pop(question_id, None)
+    if not position:
+        return
+    subject, difficulty, index = position
+    pool = _pools[subject][difficulty]
+    last_id = pool.pop()
+    if last_id != question_id:
+        pool[index] = last_id
+        _positions[last_id] = (subject, difficulty, index)
+
+async def load_question_pools(db: AsyncSession, version: Optional[int]) -> None:
+    global _loaded_version, _loaded_at
+    entries = await question_queries.get_question_pool_entries(db)
+    _pools.clear()
+    _positions.clear()
+    for question_id, subject, difficulty in entries:
+        _add(question_id, subject, difficulty)
+    _loaded_version = version
+    _loaded_at = time.monotonic()
+
+async def ensure_question_pools(db: AsyncSession, redis_client: redis.Redis) -> None:
+    version = await redis_client.get(QUESTIONS_VERSION_KEY)
+    version = int(version) if version else 0
+    if version == _loaded_version and time.monotonic() - _loaded_at < QUESTION_POOL_REFRESH_SECONDS:
+        return
+    async with _load_lock:
+        if version == _loaded_version and time.monotonic() - _loaded_at < QUESTION_POOL_REFRESH_SECONDS:
+            return
+        await load_question_pools(db, version)
+
+def apply_question_upsert(version: int, question_id: int, subject: str, difficulty: str) -> None:
+    global _loaded_version
+    if _loaded_version is None or version != _loaded_version + 1:
+        return
+    _remove(question_id)
+    _add(question_id, subject, difficulty)
+    _loaded_version = version
+
+def apply_question_removal(version: int, question_id: int) -> None:
+    global _loaded_version
+    if _loaded_version is None or version != _loaded_version + 1:
+        return
+    _remove(question_id)
+    _loaded_version = version
+
+def get_pool_size(subject: str) -> int:
+    return sum(len(pool) for pool in _pools.get(subject, {}).values())
+
+def sample_question_ids(subject: str, sample_size: int) -> Dict[str, List[int]]:
+    return {
+        difficulty: random.sample(pool, min(sample_size, len(pool)))
+        for difficulty, pool in _pools.get(subject, {}).items()
+        if pool
+    }
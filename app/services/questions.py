@@ -1,17 +1,116 @@
-from typing import List, Optional
+import json
+import math
+from typing import Any, Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+import redis.asyncio as redis
 
 from app.queries import questions as question_queries
-from app.schemas.question import QuestionCreate, QuestionResponse
+from app.schemas.question import QuestionCreate, QuestionResponse, QuestionCreateResponse
 from app.models.question import Question
+from app.services.question_pool import (
+    QUESTIONS_VERSION_KEY, apply_question_upsert, apply_question_removal
+)
+from app.services.subject_catalog import get_subject_catalog
+from app.utils.pagination import encode_cursor, decode_cursor
+
+QUESTION_COUNTS_KEY = "questions:counts"
+QUESTION_COUNTS_TTL_SECONDS = 86400
+QUESTION_PERFORMANCE_KEY = "questions:performance"
+QUESTION_PERFORMANCE_TTL_SECONDS = 60
+
+APPLY_COUNT_DELTAS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for i = 1, #ARGV, 2 do
+    if redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1]) <= 0 then
+        redis.call('HDEL', KEYS[1], ARGV[i])
+    end
+end
+return 1
+"""
+
+REPLACE_COUNTS_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+for i = 3, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+async def invalidate_question_caches(redis_client: redis.Redis) -> int:
+    return await redis_client.incr(QUESTIONS_VERSION_KEY)
+
+def get_question_count_field(kind: str, name: Optional[str]) -> str:
+    # questions without a difficulty are counted under an empty name
+    return f"{kind}:{name or ''}"
+
+def add_question_count_delta(
+    deltas: Dict[str, int],
+    subject: str,
+    difficulty: Optional[str],
+    delta: int
+) -> Dict[str, int]:
+    for field in (
+        "total",
+        get_question_count_field("subject", subject),
+        get_question_count_field("difficulty", difficulty)
+    ):
+        deltas[field] = deltas.get(field, 0) + delta
+    return deltas
+
+async def adjust_question_counts(redis_client: redis.Redis, deltas: Dict[str, int]) -> None:
+    arguments = []
+    for field, delta in deltas.items():
+        if delta:
+            arguments.extend([field, delta])
+    if arguments:
+        await redis_client.eval(APPLY_COUNT_DELTAS_SCRIPT, 1, QUESTION_COUNTS_KEY, *arguments)
+
+async def get_question_counts(db: AsyncSession, redis_client: redis.Redis) -> Dict[str, Any]:
+    fields = await redis_client.hgetall(QUESTION_COUNTS_KEY)
+    if fields:
+        counts = {"total_questions": 0, "by_subject": {}, "by_difficulty": {}}
+        for field, value in fields.items():
+            kind, _, name = field.partition(":")
+            if kind == "total":
+                counts["total_questions"] = int(value)
+            else:
+                counts[f"by_{kind}"][name or None] = int(value)
+        return counts
+    
+    # a write landing between the count and the fill bumps the version, so the stale fill is skipped
+    version = await redis_client.get(QUESTIONS_VERSION_KEY)
+    counts = await question_queries.get_question_counts(db)
+    fields = {"total": counts["total_questions"]}
+    for subject, count in counts["by_subject"].items():
+        fields[get_question_count_field("subject", subject)] = count
+    for difficulty, count in counts["by_difficulty"].items():
+        fields[get_question_count_field("difficulty", difficulty)] = count
+    
+    arguments = [version or "", QUESTION_COUNTS_TTL_SECONDS]
+    for field, count in fields.items():
+        arguments.extend([field, count])
+    await redis_client.eval(
+        REPLACE_COUNTS_SCRIPT, 2, QUESTION_COUNTS_KEY, QUESTIONS_VERSION_KEY, *arguments
+    )
+    return counts
 
 async def create_question(
     db: AsyncSession,
+    redis_client: redis.Redis,
     question_data: QuestionCreate
-) -> Question:
+) -> QuestionCreateResponse:
     try:
-        return await question_queries.create_question(
+        duplicates = await question_queries.find_similar_questions(
+            db, [question_data.question_text]
+        )
+        question = await question_queries.create_question(
             db=db,
             subject=question_data.subject,
             question_text=question_data.question_text,
@@ -25,21 +124,46 @@ async def create_question(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create question: {str(e)}"
         )
+    
+    version = await invalidate_question_caches(redis_client)
+    apply_question_upsert(version, question.id, question.subject, question.difficulty)
+    await adjust_question_counts(
+        redis_client,
+        add_question_count_delta({}, question.subject, question.difficulty, 1)
+    )
+    
+    response = QuestionCreateResponse.model_validate(question)
+    response.possible_duplicates = duplicates.get(0, [])
+    return response
 
 async def get_questions(
     db: AsyncSession,
     subject: Optional[str] = None,
     difficulty: Optional[str] = None,
     limit: int = 50,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    search: Optional[str] = None
 ) -> List[Question]:
+    after_id = None
+    if cursor:
+        try:
+            after_id = int(decode_cursor(cursor, 1)[0])
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
     try:
         return await question_queries.get_questions_with_filters(
             db=db,
             subject=subject,
             difficulty=difficulty,
             limit=limit,
-            offset=offset
+            offset=offset,
+            after_id=after_id,
+            search=search
         )
     except Exception as e:
         raise HTTPException(
@@ -47,6 +171,11 @@ async def get_questions(
             detail=f"Failed to get questions: {str(e)}"
         )
 
+def get_next_question_cursor(questions: List[Question], limit: int) -> Optional[str]:
+    if len(questions) < limit:
+        return None
+    return encode_cursor([questions[-1].id])
+
 async def get_question_by_id(db: AsyncSession, question_id: int) -> Question:
     try:
         question = await question_queries.get_question_by_id(db, question_id)
@@ -68,6 +197,7 @@ async def get_question_by_id(db: AsyncSession, question_id: int) -> Question:
 
 async def update_question(
     db: AsyncSession,
+    redis_client: redis.Redis,
     question_id: int,
     question_data: QuestionCreate
 ) -> Question:
@@ -80,7 +210,12 @@ async def update_question(
                 detail="Question not found"
             )
         
-        return await question_queries.update_question(
+        deltas = add_question_count_delta({}, question.subject, question.difficulty, -1)
+        difficulty_overridden = (
+            "difficulty" in question_data.model_fields_set
+            and question_data.difficulty != question.difficulty
+        )
+        question = await question_queries.update_question(
             db=db,
             question=question,
             subject=question_data.subject,
@@ -88,8 +223,19 @@ async def update_question(
             options=question_data.options,
             correct_answer=question_data.correct_answer,
             difficulty=question_data.difficulty,
-            points=question_data.points
+            points=question_data.points,
+            difficulty_locked=question.difficulty_locked or difficulty_overridden
         )
+        
+        version = await invalidate_question_caches(redis_client)
+        pool_entry = await question_queries.get_question_pool_entry(db, question.id)
+        if pool_entry:
+            apply_question_upsert(version, *pool_entry)
+        await adjust_question_counts(
+            redis_client,
+            add_question_count_delta(deltas, question.subject, question.difficulty, 1)
+        )
+        return question
     except HTTPException:
         raise
     except Exception as e:
@@ -98,7 +244,11 @@ async def update_question(
             detail=f"Failed to update question: {str(e)}"
         )
 
-async def delete_question(db: AsyncSession, question_id: int) -> dict:
+async def delete_question(
+    db: AsyncSession,
+    redis_client: redis.Redis,
+    question_id: int
+) -> dict:
     try:
         question = await question_queries.get_question_by_id(db, question_id)
         
@@ -108,7 +258,11 @@ async def delete_question(db: AsyncSession, question_id: int) -> dict:
                 detail="Question not found"
             )
         
+        deltas = add_question_count_delta({}, question.subject, question.difficulty, -1)
         await question_queries.delete_question(db, question)
+        version = await invalidate_question_caches(redis_client)
+        apply_question_removal(version, question_id)
+        await adjust_question_counts(redis_client, deltas)
         
         return {
             "success": True,
@@ -122,18 +276,61 @@ async def delete_question(db: AsyncSession, question_id: int) -> dict:
             detail=f"Failed to delete question: {str(e)}"
         )
 
-async def get_available_subjects(db: AsyncSession) -> List[str]:
+async def get_available_subjects(db: AsyncSession, redis_client: redis.Redis) -> List[str]:
     try:
-        return await question_queries.get_distinct_subjects(db)
+        return list(await get_subject_catalog(db, redis_client))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get subjects: {str(e)}"
         )
 
-async def get_question_statistics(db: AsyncSession) -> dict:
+async def get_question_performance(db: AsyncSession, question_id: int) -> dict:
     try:
-        return await question_queries.get_question_stats(db)
+        performance = await question_queries.get_question_performance(db, question_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get question performance: {str(e)}"
+        )
+    
+    if not performance:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question not found"
+        )
+    
+    attempts = performance["attempts"]
+    mean_response_time = performance["response_time_sum"] / attempts if attempts else 0
+    variance = performance["response_time_sq_sum"] / attempts - mean_response_time ** 2 if attempts else 0
+    
+    return {
+        "question_id": performance["id"],
+        "difficulty": performance["difficulty"],
+        "calibrated_difficulty": performance["calibrated_difficulty"],
+        "attempts": attempts,
+        "correct_count": performance["correct_count"],
+        "accuracy": performance["correct_count"] / attempts if attempts else 0,
+        "average_response_time": mean_response_time,
+        "response_time_stddev": math.sqrt(max(variance, 0))
+    }
+
+async def get_question_statistics(db: AsyncSession, redis_client: redis.Redis) -> dict:
+    try:
+        counts = await get_question_counts(db, redis_client)
+        
+        cached_performance = await redis_client.get(QUESTION_PERFORMANCE_KEY)
+        if cached_performance:
+            performance = json.loads(cached_performance)
+        else:
+            performance = await question_queries.get_performance_by_difficulty(db)
+            await redis_client.set(
+                QUESTION_PERFORMANCE_KEY,
+                json.dumps(performance),
+                ex=QUESTION_PERFORMANCE_TTL_SECONDS
+            )
+        
+        return {**counts, "performance_by_difficulty": performance}
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,64 @@
+import math
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from app.services.scoring import MIN_TIME_MULTIPLIER, calculate_points
+
+def calculate_points_vectorized(
+    is_correct: np.ndarray,
+    base_points: np.ndarray,
+    response_time: np.ndarray,
+    max_time: float
+) -> np.ndarray:
+    k = math.log(2) / max_time
+    time_multiplier = np.maximum(MIN_TIME_MULTIPLIER, np.exp(-k * response_time))
+    return np.where(is_correct, base_points * time_multiplier, 0.0)
+
+def rescore_rows(rows: List[Any], max_time: float) -> Dict[str, np.ndarray]:
+    ids = np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows))
+    session_ids = np.fromiter((row.game_session_id for row in rows), dtype=np.int64, count=len(rows))
+    is_correct = np.fromiter((bool(row.is_correct) for row in rows), dtype=bool, count=len(rows))
+    response_time = np.fromiter((row.response_time or 0.0 for row in rows), dtype=np.float64, count=len(rows))
+    base_points = np.fromiter((row.points or 0 for row in rows), dtype=np.float64, count=len(rows))
+    current = np.fromiter((row.points_earned or 0.0 for row in rows), dtype=np.float64, count=len(rows))
+    
+    points = calculate_points_vectorized(is_correct, base_points, response_time, max_time)
+    changed = ~np.isclose(points, current, rtol=0, atol=1e-9)
+    
+    return {
+        "ids": ids[changed],
+        "session_ids": session_ids[changed],
+        "old_points": current[changed],
+        "new_points": points[changed],
+    }
+
+def benchmark_scoring(size: int, max_time: float, repeat: int = 3) -> Dict[str, Any]:
+    rng = np.random.default_rng(0)
+    is_correct = rng.random(size) < 0.6
+    base_points = rng.choice([5.0, 10.0, 15.0, 20.0], size)
+    response_time = rng.uniform(0, max_time * 1.5, size)
+    
+    scalar_seconds = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        scalar = [
+            calculate_points(bool(c), b, float(t), max_time)
+            for c, b, t in zip(is_correct, base_points, response_time)
+        ]
+        scalar_seconds = min(scalar_seconds, time.perf_counter() - started)
+    
+    vectorized_seconds = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        vectorized = calculate_points_vectorized(is_correct, base_points, response_time, max_time)
+        vectorized_seconds = min(vectorized_seconds, time.perf_counter() - started)
+    
+    return {
+        "rows": size,
+        "scalar_seconds": scalar_seconds,
+        "vectorized_seconds": vectorized_seconds,
+        "speedup": scalar_seconds / vectorized_seconds if vectorized_seconds else float("inf"),
+        "matches": bool(np.allclose(scalar, vectorized)),
+    }
@@ -0,0 +1,160 @@
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from sqlalchemy.ext.asyncio import AsyncSession
+import redis.asyncio as redis
+
+from app.queries import scoring as scoring_queries
+from app.services.answer_stream import get_pending_answers_key
+from app.services.scoring import get_game_scores_key
+from app.config.config import Config
+
+config = Config()
+logger = logging.getLogger(__name__)
+
+SCORE_RECONCILE_TOLERANCE = float(config.SCORE_RECONCILE_TOLERANCE)
+SCORE_RECONCILE_METRICS_KEY = "metrics:score_reconciliation"
+LIVE_SCORES_TTL_SECONDS = 3600
+
+APPLY_SCORE_CORRECTIONS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for i = 1, #ARGV, 3 do
+    if (redis.call('HGET', KEYS[1], ARGV[i]) or '') ~= ARGV[i + 1] then
+        return 0
+    end
+end
+for i = 1, #ARGV, 3 do
+    redis.call('HINCRBYFLOAT', KEYS[1], ARGV[i], ARGV[i + 2])
+end
+return 1
+"""
+
+def group_durable_scores(rows: List[Any]) -> Dict[int, Dict[str, float]]:
+    durable = {}
+    for row in rows:
+        fields = durable.setdefault(row.game_id, {})
+        score = float(row.total_score or 0.0)
+        fields[f"u:{row.user_id}"] = score
+        if row.team_id is not None:
+            fields[f"t:{row.team_id}"] = fields.get(f"t:{row.team_id}", 0.0) + score
+    return durable
+
+async def reconcile_game_scores(
+    db: AsyncSession,
+    redis_client: redis.Redis,
+    game_ids: List[int],
+    repair: bool = False,
+    tolerance: float = SCORE_RECONCILE_TOLERANCE
+) -> Dict[str, Any]:
+    
+    pipe = redis_client.pipeline(transaction=False)
+    for game_id in game_ids:
+        pipe.hgetall(get_game_scores_key(game_id))
+        pipe.get(get_pending_answers_key(game_id))
+    replies = await pipe.execute()
+    
+    durable = group_durable_scores(await scoring_queries.get_durable_scores(db, game_ids))
+    
+    result = {
+        "games_checked": 0,
+        "games_pending": 0,
+        "games_missing_live": 0,
+        "games_drifted": 0,
+        "fields_drifted": 0,
+        "max_drift": 0.0,
+        "games_repaired": 0,
+        "drift": []
+    }
+    corrections = {}
+    
+    for index, game_id in enumerate(game_ids):
+        live, pending = replies[index * 2], replies[index * 2 + 1]
+        if not live:
+            result["games_missing_live"] += 1
+            continue
+        if int(pending or 0) > 0:
+            result["games_pending"] += 1
+            continue
+        result["games_checked"] += 1
+    
+        game_corrections = {}
+        for field, expected in durable.get(game_id, {}).items():
+            actual = float(live.get(field, 0.0))
+            drift = expected - actual
+            if abs(drift) > tolerance:
+                game_corrections[field] = (live.get(field, ""), drift)
+                result["drift"].append({
+                    "game_id": game_id,
+                    "field": field,
+                    "live": actual,
+                    "durable": expected
+                })
+                result["max_drift"] = max(result["max_drift"], abs(drift))
+    
+        if game_corrections:
+            result["games_drifted"] += 1
+            result["fields_drifted"] += len(game_corrections)
+            corrections[game_id] = game_corrections
+    
+    if repair and corrections:
+        pipe = redis_client.pipeline(transaction=False)
+        for game_id, game_corrections in corrections.items():
+            arguments = [
+                item for field, (snapshot, drift) in game_corrections.items()
+                for item in (field, snapshot, drift)
+            ]
+            pipe.eval(APPLY_SCORE_CORRECTIONS_SCRIPT, 1, get_game_scores_key(game_id), *arguments)
+        result["games_repaired"] = sum(await pipe.execute())
+    
+    return result
+
+async def reconcile_scores(
+    db: AsyncSession,
+    redis_client: redis.Redis,
+    batch_size: int = 1000,
+    repair: bool = False,
+    tolerance: float = SCORE_RECONCILE_TOLERANCE
+) -> Dict[str, Any]:
+    
+    started = time.perf_counter()
+    finished_since = datetime.utcnow() - timedelta(seconds=LIVE_SCORES_TTL_SECONDS)
+    summary = {
+        "games_checked": 0,
+        "games_pending": 0,
+        "games_missing_live": 0,
+        "games_drifted": 0,
+        "fields_drifted": 0,
+        "max_drift": 0.0,
+        "games_repaired": 0
+    }
+    drift = []
+    after_id = 0
+    
+    while True:
+        game_ids = await scoring_queries.get_reconcilable_game_ids(
+            db, after_id, batch_size, finished_since
+        )
+        if not game_ids:
+            break
+        after_id = game_ids[-1]
+    
+        batch = await reconcile_game_scores(db, redis_client, game_ids, repair, tolerance)
+        drift.extend(batch.pop("drift"))
+        for key, value in batch.items():
+            summary[key] = max(summary[key], value) if key == "max_drift" else summary[key] + value
+    
+    summary["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    summary["repair"] = int(repair)
+    summary["finished_at"] = datetime.utcnow().isoformat()
+    
+    await redis_client.hset(SCORE_RECONCILE_METRICS_KEY, mapping=summary)
+    log = logger.warning if summary["games_drifted"] else logger.info
+    log("Score reconciliation: %s", summary)
+    
+    return {**summary, "drift": drift}
+
+async def get_score_reconciliation_metrics(redis_client: redis.Redis) -> Dict[str, Any]:
+    return await redis_client.hgetall(SCORE_RECONCILE_METRICS_KEY)
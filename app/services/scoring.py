@@ -1,9 +1,19 @@
 import json
 import math
-from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis
 from app.queries import scoring as scoring_queries
+from app.services.answer_stream import enqueue_answer
+
+SUBMISSION_PENDING = "pending"
+MAX_RESPONSE_TIME = 10
+MIN_TIME_MULTIPLIER = 0.5
+FINISHED_GAME_STATS_TTL_SECONDS = 30 * 24 * 3600
+
+def get_submission_key(game_id: int, question_id: int, user_id: int) -> str:
+    return f"game:{game_id}:question:{question_id}:user:{user_id}:submission"
 
 async def submit_answer(
     db: AsyncSession,
@@ -15,6 +25,43 @@ async def submit_answer(
     response_time: float
 ) -> Dict[str, Any]:
     
+    submission_key = get_submission_key(game_id, question_id, user_id)
+    if not await redis_client.set(submission_key, SUBMISSION_PENDING, nx=True, ex=3600):
+        previous = await redis_client.get(submission_key)
+        if previous and previous != SUBMISSION_PENDING:
+            result = json.loads(previous)
+            if "total_score" not in result:
+                # stored with the enqueued answer, the totals already include it
+                result.update(await get_user_score_totals(redis_client, game_id, user_id))
+            return {**result, "duplicate": True}
+        raise ValueError("Answer is already being processed")
+    
+    try:
+        result = await record_answer(
+            db, redis_client, game_id, user_id, question_id, user_answer, response_time
+        )
+    except BaseException:
+        if await redis_client.get(submission_key) == SUBMISSION_PENDING:
+            await redis_client.delete(submission_key)
+        raise
+    
+    await redis_client.set(submission_key, json.dumps(result), ex=3600)
+    
+    from app.services.game import check_and_advance_question
+    await check_and_advance_question(db, redis_client, game_id)
+    
+    return result
+
+async def record_answer(
+    db: AsyncSession,
+    redis_client: redis.Redis,
+    game_id: int,
+    user_id: int,
+    question_id: int,
+    user_answer: str,
+    response_time: float
+) -> Dict[str, Any]:
+    
     game_data = await redis_client.get(f"game:{game_id}")
     if not game_data:
         raise ValueError("Game not found or not active")
@@ -39,37 +86,50 @@ async def submit_answer(
         is_correct=is_correct,
         base_points=question_data["points"],
         response_time=response_time,
-        max_time=10
+        max_time=MAX_RESPONSE_TIME
     )
     
-    game_session = await scoring_queries.get_game_session(db, game_id, user_id)
+    game_session_id = game_info.get("sessions", {}).get(str(user_id))
+    game_created_at = game_info.get("created_at")
+    if game_session_id is None or game_created_at is None:
+        game_session = await scoring_queries.get_game_session(db, game_id, user_id)
+        if not game_session:
+            raise ValueError("Game session not found")
+        game_session_id = game_session.id
+        game_created_at = game_session.game_created_at.isoformat()
     
-    if not game_session:
-        raise ValueError("Game session not found")
-    
-    await scoring_queries.create_answer(
-        db, game_session.id, question_id, user_answer, 
-        is_correct, response_time, points_earned
+    pipe = redis_client.pipeline(transaction=True)
+    enqueue_answer(pipe, {
+        "game_id": game_id,
+        "game_session_id": game_session_id,
+        "game_created_at": game_created_at,
+        "question_id": question_id,
+        "user_answer": user_answer,
+        "is_correct": is_correct,
+        "response_time": response_time,
+        "points_earned": points_earned,
+        "answered_at": datetime.now(timezone.utc).isoformat()
+    })
+    pipe.set(
+        get_submission_key(game_id, question_id, user_id),
+        json.dumps({"is_correct": is_correct, "points_earned": points_earned}),
+        ex=3600
     )
-    
-    await scoring_queries.update_game_session_stats(
-        db, game_session, points_earned, response_time, is_correct
+    live_offset = len(pipe.command_stack)
+    update_real_time_scores(
+        pipe, game_id, user_id, get_user_team_id(game_info, user_id),
+        points_earned, is_correct
     )
-    
-    await update_real_time_scores(redis_client, game_id, user_id, points_earned)
+    results = await pipe.execute()
+    stats = get_real_time_score_totals(results[live_offset:])
     
     answer_key = f"game:{game_id}:question:{question_id}:user:{user_id}:answered"
     await redis_client.set(answer_key, "1", ex=3600)
     
-    from app.services.game import check_and_advance_question
-    await check_and_advance_question(db, redis_client, game_id)
-    
     return {
         "is_correct": is_correct,
         "points_earned": points_earned,
-        "total_score": game_session.total_score,
-        "correct_answers": game_session.correct_answers,
-        "total_answers": game_session.total_answers
+        **stats
     }
 
 def calculate_points(
@@ -85,42 +145,65 @@ def calculate_points(
     k = math.log(2) / max_time
     time_multiplier = math.exp(-k * response_time)
     
-    time_multiplier = max(0.5, time_multiplier)
+    time_multiplier = max(MIN_TIME_MULTIPLIER, time_multiplier)
     
     return base_points * time_multiplier
 
-async def update_real_time_scores(
-    redis_client: redis.Redis,
+def get_game_scores_key(game_id: int) -> str:
+    return f"game:{game_id}:scores"
+
+def get_user_team_id(game_info: Dict[str, Any], user_id: int) -> Optional[int]:
+    for team in game_info.get("teams", []):
+        if user_id in team["players"]:
+            return team["team_id"]
+    return None
+
+def update_real_time_scores(
+    pipe: Any,
     game_id: int,
     user_id: int,
-    points_earned: float
+    team_id: Optional[int],
+    points_earned: float,
+    is_correct: bool
 ) -> None:
     
-    user_score_key = f"game:{game_id}:user:{user_id}:score"
-    await redis_client.incrbyfloat(user_score_key, points_earned)
-    await redis_client.expire(user_score_key, 3600)
+    scores_key = get_game_scores_key(game_id)
+    pipe.hincrbyfloat(scores_key, f"u:{user_id}", points_earned)
+    pipe.hincrby(scores_key, f"n:{user_id}", 1)
+    pipe.hincrby(scores_key, f"c:{user_id}", int(is_correct))
+    if team_id:
+        pipe.hincrbyfloat(scores_key, f"t:{team_id}", points_earned)
+    pipe.expire(scores_key, 3600)
+
+def get_real_time_score_totals(results: List[Any]) -> Dict[str, Any]:
+    return {
+        "total_score": float(results[0]),
+        "correct_answers": results[2],
+        "total_answers": results[1]
+    }
+
+async def get_user_score_totals(
+    redis_client: redis.Redis,
+    game_id: int,
+    user_id: int
+) -> Dict[str, Any]:
     
-    game_data = await redis_client.get(f"game:{game_id}")
-    if game_data:
-        game_info = json.loads(game_data)
-        
-        user_team_id = None
-        for team in game_info.get("teams", []):
-            if user_id in team["players"]:
-                user_team_id = team["team_id"]
-                break
-        
-        if user_team_id:
-            team_score_key = f"game:{game_id}:team:{user_team_id}:score"
-            await redis_client.incrbyfloat(team_score_key, points_earned)
-            await redis_client.expire(team_score_key, 3600)
+    total_score, total_answers, correct_answers = await redis_client.hmget(
+        get_game_scores_key(game_id), f"u:{user_id}", f"n:{user_id}", f"c:{user_id}"
+    )
+    return get_real_time_score_totals([
+        float(total_score or 0.0), int(total_answers or 0), int(correct_answers or 0)
+    ])
 
 async def get_real_time_scores(
     redis_client: redis.Redis,
     game_id: int
 ) -> Dict[str, Any]:
     
-    game_data = await redis_client.get(f"game:{game_id}")
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.get(f"game:{game_id}")
+    pipe.hgetall(get_game_scores_key(game_id))
+    game_data, scores = await pipe.execute()
     if not game_data:
         return {}
     
@@ -131,19 +214,14 @@ async def get_real_time_scores(
     
     for team in game_info.get("teams", []):
         team_id = team["team_id"]
-        team_score_key = f"game:{game_id}:team:{team_id}:score"
-        team_score = await redis_client.get(team_score_key)
-        team_scores[team_id] = float(team_score) if team_score else 0.0
         
         team_user_scores = {}
         for user_id in team["players"]:
-            user_score_key = f"game:{game_id}:user:{user_id}:score"
-            user_score = await redis_client.get(user_score_key)
-            user_scores[user_id] = float(user_score) if user_score else 0.0
+            user_scores[user_id] = float(scores.get(f"u:{user_id}", 0.0))
             team_user_scores[user_id] = user_scores[user_id]
         
         team_scores[team_id] = {
-            "total_score": team_scores[team_id],
+            "total_score": float(scores.get(f"t:{team_id}", 0.0)),
             "user_scores": team_user_scores
         }
     
@@ -153,34 +231,48 @@ async def get_real_time_scores(
         "user_scores": user_scores
     }
 
+def get_user_game_stats_key(game_id: int, user_id: int) -> str:
+    return f"game:{game_id}:user:{user_id}:stats"
+
+async def invalidate_user_game_stats(redis_client: redis.Redis, sessions: List[Any]) -> None:
+    if sessions:
+        await redis_client.delete(*[
+            get_user_game_stats_key(session.game_id, session.user_id) for session in sessions
+        ])
+
 async def get_user_game_stats(
     db: AsyncSession,
+    redis_client: redis.Redis,
     user_id: int,
     game_id: int
-) -> Optional[Dict[str, Any]]:
+) -> Optional[str]:
     
-    game_session = await scoring_queries.get_game_session_with_answers(
-        db, user_id, game_id
-    )
+    stats_key = get_user_game_stats_key(game_id, user_id)
+    cached = await redis_client.get(stats_key)
+    if cached:
+        return cached
     
-    if not game_session:
+    row = await scoring_queries.get_user_game_stats_row(db, user_id, game_id)
+    
+    if not row:
         return None
     
-    return {
-        "game_id": game_id,
-        "user_id": user_id,
-        "total_score": game_session.total_score,
-        "correct_answers": game_session.correct_answers,
-        "total_answers": game_session.total_answers,
-        "accuracy": (game_session.correct_answers / game_session.total_answers) if game_session.total_answers > 0 else 0,
-        "average_response_time": game_session.average_response_time,
-        "answers": [
-            {
-                "question_id": answer.question_id,
-                "user_answer": answer.user_answer,
-                "is_correct": answer.is_correct,
-                "points_earned": answer.points_earned,
-                "response_time": answer.response_time
-            } for answer in game_session.answers
-        ]
-    } 
\ No newline at end of file
+    answers = json.loads(row.answers) if isinstance(row.answers, str) else row.answers
+    payload = json.dumps({
+        "success": True,
+        "stats": {
+            "game_id": game_id,
+            "user_id": user_id,
+            "total_score": row.total_score,
+            "correct_answers": row.correct_answers,
+            "total_answers": row.total_answers,
+            "accuracy": (row.correct_answers / row.total_answers) if row.total_answers > 0 else 0,
+            "average_response_time": row.average_response_time,
+            "answers": answers
+        }
+    })
+    
+    if row.status == "FINISHED":
+        await redis_client.set(stats_key, payload, ex=FINISHED_GAME_STATS_TTL_SECONDS)
+    
+    return payload 
\ No newline at end of file
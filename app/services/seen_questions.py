@@ -0,0 +1,85 @@
+import hashlib
+import math
+from typing import Dict, List
+import redis.asyncio as redis
+
+from app.config.config import Config
+
+config = Config()
+
+SEEN_CAPACITY = int(config.SEEN_QUESTIONS_CAPACITY)
+SEEN_ERROR_RATE = float(config.SEEN_QUESTIONS_ERROR_RATE)
+SEEN_TTL_SECONDS = int(config.SEEN_QUESTIONS_TTL_DAYS) * 86400
+SEEN_FILTER_BITS = math.ceil(-SEEN_CAPACITY * math.log(SEEN_ERROR_RATE) / math.log(2) ** 2)
+SEEN_FILTER_HASHES = max(1, round(SEEN_FILTER_BITS / SEEN_CAPACITY * math.log(2)))
+
+def get_filter_key(user_id: int, subject: str) -> str:
+    return f"seen_questions:{user_id}:{subject}"
+
+def get_bit_positions(question_id: int) -> List[int]:
+    digest = hashlib.blake2b(str(question_id).encode(), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "big")
+    h2 = int.from_bytes(digest[8:], "big") | 1
+    return [(h1 + i * h2) % SEEN_FILTER_BITS for i in range(SEEN_FILTER_HASHES)]
+
+async def filter_unseen_questions(
+    redis_client: redis.Redis,
+    user_ids: List[int],
+    subject: str,
+    question_ids: List[int]
+) -> List[int]:
+    if not user_ids or not question_ids:
+        return list(question_ids)
+    
+    positions = {question_id: get_bit_positions(question_id) for question_id in question_ids}
+    arguments = []
+    for question_id in question_ids:
+        for offset in positions[question_id]:
+            arguments.extend(["GET", "u1", offset])
+    
+    pipe = redis_client.pipeline(transaction=False)
+    for user_id in user_ids:
+        pipe.execute_command("BITFIELD", get_filter_key(user_id, subject), *arguments)
+    results = await pipe.execute()
+    
+    seen = set()
+    for bits in results:
+        for i, question_id in enumerate(question_ids):
+            question_bits = bits[i * SEEN_FILTER_HASHES:(i + 1) * SEEN_FILTER_HASHES]
+            if all(question_bits):
+                seen.add(question_id)
+    
+    return [question_id for question_id in question_ids if question_id not in seen]
+
+async def mark_questions_seen(
+    redis_client: redis.Redis,
+    user_ids: List[int],
+    subject: str,
+    question_ids: List[int]
+) -> None:
+    if not user_ids or not question_ids:
+        return
+    
+    arguments = []
+    for question_id in question_ids:
+        for offset in get_bit_positions(question_id):
+            arguments.extend(["SET", "u1", offset, 1])
+    
+    pipe = redis_client.pipeline(transaction=False)
+    for user_id in user_ids:
+        key = get_filter_key(user_id, subject)
+        pipe.execute_command("BITFIELD", key, *arguments)
+        pipe.expire(key, SEEN_TTL_SECONDS)
+        pipe.incrby(f"{key}:count", len(question_ids))
+        pipe.expire(f"{key}:count", SEEN_TTL_SECONDS)
+    results = await pipe.execute()
+    
+    counts: Dict[int, int] = {
+        user_id: results[i * 4 + 2] for i, user_id in enumerate(user_ids)
+    }
+    full_keys = [
+        get_filter_key(user_id, subject) for user_id, count in counts.items()
+        if count > SEEN_CAPACITY
+    ]
+    if full_keys:
+        await redis_client.delete(*full_keys, *[f"{key}:count" for key in full_keys])
@@ -0,0 +1,43 @@
+import json
+from typing import Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+import redis.asyncio as redis
+
+from app.queries import questions as question_queries
+from app.services.question_pool import QUESTIONS_VERSION_KEY, QUESTIONS_PER_GAME
+
+SUBJECT_CATALOG_TTL_SECONDS = 86400
+
+_catalog: Optional[Dict[str, int]] = None
+_catalog_version: Optional[int] = None
+
+async def get_subject_catalog(db: AsyncSession, redis_client: redis.Redis) -> Dict[str, int]:
+    global _catalog, _catalog_version
+    version = await redis_client.get(QUESTIONS_VERSION_KEY)
+    version = int(version) if version else 0
+    if _catalog is not None and version == _catalog_version:
+        return _catalog
+    
+    cache_key = f"questions:subjects:{version}"
+    cached = await redis_client.get(cache_key)
+    if cached:
+        catalog = json.loads(cached)
+    else:
+        catalog = await question_queries.get_subject_question_counts(db)
+        await redis_client.set(cache_key, json.dumps(catalog), ex=SUBJECT_CATALOG_TTL_SECONDS)
+    
+    _catalog = catalog
+    _catalog_version = version
+    return catalog
+
+async def ensure_subject_playable(
+    db: AsyncSession,
+    redis_client: redis.Redis,
+    subject: str
+) -> None:
+    catalog = await get_subject_catalog(db, redis_client)
+    count = catalog.get(subject, 0)
+    if count < QUESTIONS_PER_GAME:
+        raise ValueError(
+            f"Subject {subject} has {count} questions, at least {QUESTIONS_PER_GAME} are needed"
+        )
@@ -0,0 +1,82 @@
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+
+from app.queries import auth as auth_queries
+from app.queries import users as user_queries
+from app.utils.pagination import encode_cursor, decode_cursor
+
+def get_game_history_position(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    if not cursor:
+        return None
+    
+    finished_at, game_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(finished_at), int(game_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+def get_next_game_history_cursor(games: List[Any], page_size: int) -> Optional[str]:
+    if len(games) < page_size:
+        return None
+    
+    last_game = games[-1]
+    return encode_cursor([last_game.finished_at.isoformat(), last_game.game_id])
+
+async def get_user_game_history(
+    db: AsyncSession,
+    user_id: int,
+    page_size: int = 20,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    after = get_game_history_position(cursor)
+    games = await user_queries.get_user_game_summaries(db, user_id, page_size, after)
+    
+    return {
+        "games": [
+            {
+                "game_id": game.game_id,
+                "subject": game.subject,
+                "total_score": game.total_score,
+                "correct_answers": game.correct_answers,
+                "total_answers": game.total_answers,
+                "team_id": game.team_id,
+                "team_score": game.team_score,
+                "opponent_score": game.opponent_score,
+                "result": "won" if game.is_winner else "lost",
+                "teammates": game.teammates,
+                "finished_at": game.finished_at.isoformat()
+            } for game in games
+        ],
+        "next_cursor": get_next_game_history_cursor(games, page_size)
+    }
+
+async def get_user_profile_stats(db: AsyncSession, user_id: int) -> Dict[str, Any]:
+    user = await auth_queries.get_user_by_id(db, user_id)
+    if not user:
+        raise ValueError("User not found")
+    
+    subjects = await user_queries.get_user_subject_stats(db, user_id)
+    
+    return {
+        "user_id": user.id,
+        "username": user.username,
+        "total_games": user.total_games,
+        "total_wins": user.total_wins,
+        "total_score": user.total_score,
+        "win_rate": (user.total_wins / user.total_games) if user.total_games > 0 else 0,
+        "subjects": [
+            {
+                "subject": stat.subject,
+                "games_played": stat.games_played,
+                "games_won": stat.games_won,
+                "win_rate": (stat.games_won / stat.games_played) if stat.games_played > 0 else 0,
+                "total_score": stat.total_score,
+                "average_score": (stat.total_score / stat.games_played) if stat.games_played > 0 else 0,
+                "correct_answers": stat.correct_answers,
+                "total_answers": stat.total_answers,
+                "accuracy": (stat.correct_answers / stat.total_answers) if stat.total_answers > 0 else 0,
+                "average_response_time": (stat.response_time_sum / stat.total_answers) if stat.total_answers > 0 else 0
+            } for stat in subjects
+        ]
+    }
@@ -1,14 +1,25 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union, Optional
+from typing import Any, Callable, Dict, Union, Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 
 from app.config.config import Config
+from app.utils.cache import TTLCache
 
 config = Config()
 
+TOKEN_CLAIMS_VERSION = 1
+TOKEN_CACHE_MAX_ENTRIES = 10000
+TOKEN_CACHE_TTL_SECONDS = 300
+
+token_cache = TTLCache(TOKEN_CACHE_MAX_ENTRIES, TOKEN_CACHE_TTL_SECONDS)
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -17,6 +28,73 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+PASSWORD_HASH_WORKERS = int(config.PASSWORD_HASH_WORKERS)
+PASSWORD_HASH_MAX_PENDING = int(config.PASSWORD_HASH_MAX_PENDING)
+
+password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+
+password_hash_metrics: Dict[str, float] = {
+    "in_flight": 0,
+    "completed": 0,
+    "rejected": 0,
+    "queue_wait_seconds_total": 0.0,
+    "queue_wait_seconds_max": 0.0,
+    "hash_seconds_total": 0.0,
+    "hash_seconds_max": 0.0
+}
+
+async def run_password_task(func: Callable[..., Any], *args: Any) -> Any:
+    metrics = password_hash_metrics
+    if metrics["in_flight"] >= PASSWORD_HASH_MAX_PENDING:
+        metrics["rejected"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent authentication requests, please retry",
+            headers={"Retry-After": "1"},
+        )
+    
+    submitted_at = time.perf_counter()
+    
+    def timed_call():
+        started_at = time.perf_counter()
+        result = func(*args)
+        return result, started_at - submitted_at, time.perf_counter() - started_at
+    
+    def release(_future):
+        metrics["in_flight"] -= 1
+    
+    loop = asyncio.get_running_loop()
+    future = password_executor.submit(timed_call)
+    metrics["in_flight"] += 1
+    future.add_done_callback(lambda done: loop.call_soon_threadsafe(release, done))
+    result, queue_wait, hash_time = await asyncio.wrap_future(future)
+    
+    metrics["completed"] += 1
+    metrics["queue_wait_seconds_total"] += queue_wait
+    metrics["queue_wait_seconds_max"] = max(metrics["queue_wait_seconds_max"], queue_wait)
+    metrics["hash_seconds_total"] += hash_time
+    metrics["hash_seconds_max"] = max(metrics["hash_seconds_max"], hash_time)
+    return result
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await run_password_task(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await run_password_task(get_password_hash, password)
+
+def get_password_hash_metrics() -> Dict[str, float]:
+    completed = password_hash_metrics["completed"]
+    return {
+        **password_hash_metrics,
+        "workers": PASSWORD_HASH_WORKERS,
+        "max_pending": PASSWORD_HASH_MAX_PENDING,
+        "queue_wait_seconds_avg": password_hash_metrics["queue_wait_seconds_total"] / completed if completed else 0,
+        "hash_seconds_avg": password_hash_metrics["hash_seconds_total"] / completed if completed else 0
+    }
+
 def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -27,20 +105,44 @@ def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None
     encoded_jwt = jwt.encode(to_encode, config.SECRET_KEY, algorithm=config.ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str) -> str:
+def build_token_claims(user: Any) -> Dict[str, Any]:
+    return {
+        "sub": user.username,
+        "uid": user.id,
+        "adm": user.is_admin,
+        "ver": TOKEN_CLAIMS_VERSION
+    }
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    cache_key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(cache_key)
+    if payload is not None:
+        return payload
+    
     try:
         payload = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
+        if payload.get("sub") is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return username
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
-        ) 
\ No newline at end of file
+        )
+    
+    remaining = payload.get("exp", 0) - time.time()
+    if remaining > 0:
+        token_cache.set(cache_key, payload, ttl=remaining)
+    return payload
+
+def get_token_user_id(payload: Dict[str, Any]) -> Optional[int]:
+    if payload.get("ver", 0) >= TOKEN_CLAIMS_VERSION:
+        return payload.get("uid")
+    return None
+
+def verify_token(token: str) -> str:
+    return decode_access_token(token)["sub"]
\ No newline at end of file
@@ -0,0 +1,38 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,20 @@
+import base64
+import json
+from typing import Any, List
+
+
+def encode_cursor(values: List[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    
+    return values
@@ -1,6 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, matchmaking, game, leaderboard, questions
+from app.database import redis_client
+from app.routers import auth, matchmaking, game, leaderboard, questions, admin, users
+from app.services.answer_stream import start_answer_flushers, stop_answer_flushers
+from app.services.partitions import ensure_upcoming_partitions
 
 
 app = FastAPI()
@@ -11,6 +14,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(auth.router)
@@ -18,6 +22,17 @@ app.include_router(matchmaking.router)
 app.include_router(game.router)
 app.include_router(leaderboard.router)
 app.include_router(questions.router)
+app.include_router(admin.router)
+app.include_router(users.router)
+
+@app.on_event("startup")
+async def start_background_workers():
+    await ensure_upcoming_partitions()
+    await start_answer_flushers(redis_client)
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    await stop_answer_flushers()
 
 @app.get("/api/v1/health")
 def root():